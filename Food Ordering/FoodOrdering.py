@@ -9,32 +9,80 @@ menu = [
     {"name": "Fries", "price": 90}
 ]
 
-cart = []
+# Item name -> {"item": item, "quantity": n, "line": its Listbox line}
+cart = {}
+cart_lines = []   # item names in Listbox line order
+cart_total = 0
+
+# Item name -> its card, built once and packed again whenever it matches a search
+food_cards = {}
 
 def add_to_cart(item):
-    cart.append(item)
-    update_cart()
+    change_quantity(item, 1)
+
+def change_selected(delta):
+    selection = cart_list.curselection()
+    if not selection or selection[0] >= len(cart_lines):
+        return
+    line = selection[0]
+    change_quantity(cart[cart_lines[line]]["item"], delta)
+    if line < len(cart_lines):
+        cart_list.selection_set(line)
+
+def cart_line(entry):
+    item = entry["item"]
+    return f"{item['name']} x{entry['quantity']} -------- Rs.{item['price'] * entry['quantity']}"
+
+def change_quantity(item, delta):
+    # Rewrite only the item's own line and the total line
+    global cart_total
+    name = item['name']
+    entry = cart.get(name)
+    old = entry["quantity"] if entry is not None else 0
+    quantity = max(old + delta, 0)
+    if quantity == old:
+        return
+    cart_total += (quantity - old) * item['price']
+
+    if entry is None:
+        entry = cart[name] = {"item": item, "quantity": quantity, "line": len(cart_lines)}
+        cart_lines.append(name)
+        cart_list.insert(entry["line"], cart_line(entry))
+    elif quantity == 0:
+        line = entry["line"]
+        del cart[name]
+        del cart_lines[line]
+        cart_list.delete(line)
+        # Only removing a whole line shifts the lines below it
+        for later in cart_lines[line:]:
+            cart[later]["line"] -= 1
+    else:
+        entry["quantity"] = quantity
+        cart_list.delete(entry["line"])
+        cart_list.insert(entry["line"], cart_line(entry))
+    update_total()
 
-def update_cart():
-    cart_list.delete(0, tk.END)
-    total = 0
-    for food in cart:
-        cart_list.insert(tk.END, f"{food['name']} -------- Rs.{food['price']}")
-        total += food['price']
+def update_total():
+    cart_list.delete(len(cart_lines), tk.END)
     cart_list.insert(tk.END, "-" * 40)
-    cart_list.insert(tk.END, f"Total{' ' * 21}Rs.{total}")
+    cart_list.insert(tk.END, f"Total{' ' * 21}Rs.{cart_total}")
 
 def search_food():
     query = search_entry.get().lower()
-    for widget in food_frame.winfo_children():
-        widget.destroy()
+    for card in food_cards.values():
+        card.pack_forget()
     for item in menu:
         if query in item['name'].lower():
-            create_food_card(item)
+            show_food_card(item)
+
+def show_food_card(item):
+    card = food_cards.get(item['name'])
+    if card is None:
+        card = food_cards[item['name']] = create_food_card(item)
+    card.pack(side="left", padx=15, pady=15)
 
 def create_food_card(item):
     card = tk.Frame(food_frame, bd=0, bg="#f5f5f5", padx=10, pady=10, highlightbackground="#ccc", highlightthickness=1)
-    card.pack(side="left", padx=15, pady=15)
 
     img_placeholder = tk.Label(card, text="[Image]", bg="#ccc", width=15, height=7, font=("Segoe UI", 10))
     img_placeholder.pack()
@@ -47,14 +95,22 @@ def create_food_card(item):
 
     add_btn = tk.Button(card, text="Add to Cart", font=("Segoe UI", 10), bg="#4CAF50", fg="white", activebackground="#45a049", relief="flat", cursor="hand2", command=lambda: add_to_cart(item))
     add_btn.pack(pady=8)
+    return card
 
 def place_order():
     if not cart:
         messagebox.showwarning("Empty Cart", "Please add items to the cart.")
     else:
         messagebox.showinfo("Order Placed", "Thank you! Your food is on the way 🚚")
-        cart.clear()
-        update_cart()
+        clear_cart()
+
+def clear_cart():
+    global cart_total
+    cart.clear()
+    cart_lines.clear()
+    cart_total = 0
+    cart_list.delete(0, tk.END)
+    update_total()
 
 # Main window setup
 root = tk.Tk()
@@ -77,7 +133,7 @@ food_frame = tk.Frame(root, bg="white")
 food_frame.pack(side="left", padx=20, pady=10)
 
 for item in menu:
-    create_food_card(item)
+    show_food_card(item)
 
 # Cart area
 cart_frame = tk.Frame(root, bd=0, padx=15, pady=15, bg="#fdfdfd", highlightbackground="#ccc", highlightthickness=1)
@@ -88,6 +144,16 @@ cart_title.pack(pady=(0, 10))
 
 cart_list = tk.Listbox(cart_frame, width=40, height=20, font=("Courier New", 10), bg="#f0f0f0", bd=0)
 cart_list.pack()
+update_total()
+
+quantity_frame = tk.Frame(cart_frame, bg="#fdfdfd")
+quantity_frame.pack(pady=(10, 0))
+
+minus_btn = tk.Button(quantity_frame, text="−", font=("Segoe UI", 11), bg="#ddd", relief="flat", width=3, command=lambda: change_selected(-1))
+minus_btn.pack(side="left", padx=5)
+
+plus_btn = tk.Button(quantity_frame, text="+", font=("Segoe UI", 11), bg="#ddd", relief="flat", width=3, command=lambda: change_selected(1))
+plus_btn.pack(side="left", padx=5)
 
 order_btn = tk.Button(cart_frame, text="Order Now", font=("Segoe UI", 12, "bold"), bg="#ff5722", fg="white", relief="flat", cursor="hand2", padx=15, pady=5, activebackground="#e64a19")
 order_btn.config(command=place_order)
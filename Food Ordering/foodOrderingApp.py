@@ -2,6 +2,20 @@ import os
 import tkinter as tk
 from PIL import Image, ImageTk
 from tkinter import messagebox
+import queue
+from menu_index import MenuIndex
+from order_queue import OrderQueue
+
+# Images are looked up next to this file, wherever the app is launched from
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(BASE_DIR, "images")
+IMAGE_SIZE = (160, 120)
+
+# Delay before a keystroke in the search box filters the menu
+SEARCH_DEBOUNCE_MS = 150
+
+# Kitchen worker threads processing placed orders
+ORDER_WORKERS = 3
 
 # Sample menu data
 menu_items = [
@@ -25,98 +39,209 @@ menu_items = [
     {"name": "Slice", "price": 50, "category": "Dessert"},
 ]
 
-cart = []
+# Lowercase name and category lookups for live search
+menu_index = MenuIndex(menu_items)
+pending_search = None
 
-def add_to_cart(item):
-    cart.append(item)
-    update_cart()
+# Item name -> {"item": item, "quantity": n}, in the order items were first added
+cart = {}
+cart_total = 0
 
-def remove_from_cart(index):
-    if 0 <= index < len(cart):
-        del cart[index]
-        update_cart()
+# Item name -> (row frame, quantity label, price label) of its line in the cart panel
+cart_rows = {}
 
-def update_cart():
-    for widget in cart_items_frame.winfo_children():
-        widget.destroy()
+# Item name -> ready PhotoImage, or None for items without a usable image
+image_cache = {}
+missing_images = []
 
-    total = 0
-    if not cart:
-        empty_label = tk.Label(cart_items_frame, text="Your cart is empty", font=("Segoe UI", 10, "italic"), bg="#fdfdfd", fg="#888")
-        empty_label.pack(pady=20)
-    else:
-        for i, food in enumerate(cart):
-            item_frame = tk.Frame(cart_items_frame, bg="#f5f5f5", padx=5, pady=5, highlightbackground="#ddd", highlightthickness=1)
-            item_frame.pack(fill="x", pady=2)
-
-            tk.Label(item_frame, text=food['name'], font=("Segoe UI", 10, "bold"), bg="#f5f5f5").pack(side="left", padx=5)
-            tk.Label(item_frame, text=f"Rs.{food['price']}", font=("Segoe UI", 10), bg="#f5f5f5").pack(side="left", padx=10)
-            tk.Button(item_frame, text="✕", font=("Segoe UI", 8), bg="#ff5722", fg="white", width=2, relief="flat", command=lambda idx=i: remove_from_cart(idx)).pack(side="right", padx=5)
+# Item name -> its card, built on first display and re-gridded afterwards
+food_cards = {}
+shown_cards = []
 
-            total += food['price']
+def add_to_cart(item):
+    change_quantity(item, 1)
+
+def remove_from_cart(item):
+    entry = cart.get(item['name'])
+    if entry is not None:
+        change_quantity(item, -entry['quantity'])
+
+def change_quantity(item, delta):
+    # Adjust one line and the running total; the other lines are left alone
+    global cart_total
+    name = item['name']
+    entry = cart.get(name)
+    old = entry['quantity'] if entry is not None else 0
+    quantity = max(old + delta, 0)
+    if quantity == old:
+        return
+
+    if quantity == 0:
+        del cart[name]
+    elif entry is None:
+        cart[name] = {"item": item, "quantity": quantity}
+    else:
+        entry['quantity'] = quantity
+    cart_total += (quantity - old) * item['price']
+    update_cart_row(item)
+    update_cart_total()
+
+def update_cart_row(item):
+    name = item['name']
+    entry = cart.get(name)
+    row = cart_rows.get(name)
+    if entry is None:
+        if row is not None:
+            row[0].destroy()
+            del cart_rows[name]
+        return
+
+    if row is None:
+        row = cart_rows[name] = create_cart_row(item)
+    row[1].config(text=str(entry['quantity']))
+    row[2].config(text=f"Rs.{entry['quantity'] * item['price']}")
+
+def create_cart_row(item):
+    item_frame = tk.Frame(cart_items_frame, bg="#f5f5f5", padx=5, pady=5, highlightbackground="#ddd", highlightthickness=1)
+    item_frame.pack(fill="x", pady=2)
+
+    tk.Label(item_frame, text=item['name'], font=("Segoe UI", 10, "bold"), bg="#f5f5f5").pack(side="left", padx=5)
+    tk.Button(item_frame, text="✕", font=("Segoe UI", 8), bg="#ff5722", fg="white", width=2, relief="flat", command=lambda: remove_from_cart(item)).pack(side="right", padx=5)
+    tk.Button(item_frame, text="+", font=("Segoe UI", 8), bg="#ddd", width=2, relief="flat", command=lambda: change_quantity(item, 1)).pack(side="right")
+    quantity_label = tk.Label(item_frame, font=("Segoe UI", 10), bg="#f5f5f5", width=3)
+    quantity_label.pack(side="right")
+    tk.Button(item_frame, text="−", font=("Segoe UI", 8), bg="#ddd", width=2, relief="flat", command=lambda: change_quantity(item, -1)).pack(side="right")
+    price_label = tk.Label(item_frame, font=("Segoe UI", 10), bg="#f5f5f5")
+    price_label.pack(side="right", padx=10)
+    return item_frame, quantity_label, price_label
+
+def update_cart_total():
+    if cart:
+        empty_label.pack_forget()
+    else:
+        empty_label.pack(pady=20)
+    total_label.config(text=f"Total: Rs.{cart_total}")
 
-    total_label.config(text=f"Total: Rs.{total}")
+def clear_cart():
+    global cart_total
+    for row in cart_rows.values():
+        row[0].destroy()
+    cart_rows.clear()
+    cart.clear()
+    cart_total = 0
+    update_cart_total()
 
 def search_food():
-    query = search_entry.get().lower()
-    filtered_menu = [item for item in menu_items if query in item['name'].lower()]
-    display_all_food(filtered_menu)
-    selected_category.set("All")
+    # Query and category are combined in one index lookup
+    global pending_search
+    if pending_search is not None:
+        root.after_cancel(pending_search)
+        pending_search = None
+    display_all_food(menu_index.search(search_var.get(), selected_category.get()))
+
+def schedule_search(*args):
+    # Filter once typing pauses instead of on every keystroke
+    global pending_search
+    if pending_search is not None:
+        root.after_cancel(pending_search)
+    pending_search = root.after(SEARCH_DEBOUNCE_MS, search_food)
 
 def filter_by_category():
-    category = selected_category.get()
-    if category == "All":
-        display_all_food()
-    else:
-        filtered = [item for item in menu_items if item['category'] == category]
-        display_all_food(filtered)
+    search_food()
 
 def display_all_food(display_menu=None):
     if display_menu is None:
         display_menu = menu_items
 
-    for widget in food_frame.winfo_children():
-        widget.destroy()
+    # Filtering only moves the pooled cards; none are destroyed or rebuilt
+    cards = [get_food_card(item) for item in display_menu]
+    keep = set(cards)
+    for card in shown_cards:
+        if card not in keep:
+            card.grid_remove()
 
     columns = 6
-    for index, item in enumerate(display_menu):
+    for index, card in enumerate(cards):
         row = index // columns
         col = index % columns
-        create_food_card(item, row, col)
+        card.grid(row=row, column=col, padx=15, pady=15)
+    shown_cards[:] = cards
 
-def create_food_card(item, row, col):
+def load_menu_images():
+    # Decode and resize every menu image once; cards only read image_cache afterwards
+    try:
+        # Match file names case-insensitively, e.g. "Cup Cake" -> cupCake.jpg
+        files = {name.lower(): name for name in os.listdir(IMAGE_DIR)}
+    except OSError as e:
+        print("Image folder error:", e)
+        files = {}
+
+    for item in menu_items:
+        name = item['name']
+        if name in image_cache:
+            continue
+        image_name = name.lower().replace(' ', '') + ".jpg"
+        try:
+            if image_name not in files:
+                raise FileNotFoundError(f"Image not found: {os.path.join(IMAGE_DIR, image_name)}")
+            img = Image.open(os.path.join(IMAGE_DIR, files[image_name]))
+            img = img.resize(IMAGE_SIZE, Image.Resampling.LANCZOS)
+            image_cache[name] = ImageTk.PhotoImage(img)
+        except Exception as e:
+            print("Image load error:", e)
+            image_cache[name] = None
+            missing_images.append(name)
+
+def get_food_card(item):
+    card = food_cards.get(item['name'])
+    if card is None:
+        card = food_cards[item['name']] = create_food_card(item)
+    return card
+
+def create_food_card(item):
     card = tk.Frame(food_frame, width=180, height=250, bd=0, bg="#f5f5f5", padx=10, pady=10, highlightbackground="#ccc", highlightthickness=1)
     card.grid_propagate(False)
-    card.grid(row=row, column=col, padx=15, pady=15)
 
-    try:
-        image_name = item['name'].lower().replace(' ', '') + ".jpg"
-        image_path = os.path.join("images", image_name)
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image not found: {image_path}")
-
-        img = Image.open(image_path)
-        img = img.resize((160, 120), Image.Resampling.LANCZOS)
-        photo = ImageTk.PhotoImage(img)
+    photo = image_cache.get(item['name'])
+    if photo is not None:
         img_label = tk.Label(card, image=photo, bg="#f5f5f5")
-        img_label.image = photo
-        img_label.pack()
-    except Exception as e:
-        print("Image load error:", e)
+    else:
         img_label = tk.Label(card, text="[No Image]", bg="#ccc", width=15, height=7, font=("Segoe UI", 10))
-        img_label.pack()
+    img_label.pack()
 
     tk.Label(card, text=item['name'], font=("Segoe UI", 12, "bold"), bg="#f5f5f5", wraplength=150, justify="center").pack(pady=(5, 0))
     tk.Label(card, text=f"Rs. {item['price']}", font=("Segoe UI", 10), bg="#f5f5f5").pack()
     tk.Button(card, text="Add to Cart", font=("Segoe UI", 10), bg="#4CAF50", fg="white", activebackground="#45a049", command=lambda: add_to_cart(item)).pack(pady=8)
+    return card
 
 def place_order():
     if not cart:
         messagebox.showwarning("Empty Cart", "Please add items to the cart.")
     else:
-        messagebox.showinfo("Order Placed", "Thank you! Your food is on the way 🚚")
-        cart.clear()
-        update_cart()
+        # Stored and processed in the background; progress shows up in the cart panel
+        items = [{"name": name, "price": entry['item']['price'], "quantity": entry['quantity']} for name, entry in cart.items()]
+        order_queue.submit(items, cart_total)
+        clear_cart()
+        order_status_label.config(text="Thank you! Your food is on the way 🚚")
+
+def drain_order_updates():
+    latest = None
+    while True:
+        try:
+            latest = order_queue.updates.get_nowait()
+        except queue.Empty:
+            break
+    if latest is not None:
+        order_status_label.config(text=f"Order #{latest[0]}: {latest[1]}")
+
+    metrics = order_queue.metrics()
+    metrics_label.config(text=f"Waiting {metrics['queue_depth']} · Cooking {metrics['in_progress']} · "
+                              f"Done {metrics['completed']} · {metrics['throughput']:.2f} orders/s")
+    root.after(200, drain_order_updates)
+
+def on_close():
+    order_queue.close()
+    root.destroy()
 
 root = tk.Tk()
 root.title("🍔 Online Food Ordering App")
@@ -126,8 +251,12 @@ root.configure(bg="white")
 search_frame = tk.Frame(root, bg="white")
 search_frame.pack(pady=15)
 
-search_entry = tk.Entry(search_frame, width=40, font=("Segoe UI", 12), bg="#ddd", relief="flat", insertbackground="black")
+search_var = tk.StringVar()
+search_var.trace_add("write", schedule_search)
+
+search_entry = tk.Entry(search_frame, textvariable=search_var, width=40, font=("Segoe UI", 12), bg="#ddd", relief="flat", insertbackground="black")
 search_entry.pack(side="left", padx=5, ipady=5)
+search_entry.bind("<Return>", lambda e: search_food())
 
 search_btn = tk.Button(search_frame, text="🔍", command=search_food, bg="#4CAF50", fg="white", font=("Segoe UI", 12), relief="flat", cursor="hand2", padx=10)
 search_btn.pack(side="left", padx=5)
@@ -160,6 +289,7 @@ def resize_food_window(event):
     food_canvas.itemconfig(food_window, width=event.width)
 food_canvas.bind("<Configure>", resize_food_window)
 
+load_menu_images()
 display_all_food()
 
 cart_frame = tk.Frame(root, bd=0, padx=15, pady=15, bg="#fdfdfd", highlightbackground="#ccc", highlightthickness=1)
@@ -185,13 +315,27 @@ def configure_cart_items_frame(event):
     cart_canvas.itemconfig(cart_canvas_window, width=event.width)
 cart_canvas.bind("<Configure>", configure_cart_items_frame)
 
+empty_label = tk.Label(cart_items_frame, text="Your cart is empty", font=("Segoe UI", 10, "italic"), bg="#fdfdfd", fg="#888")
+
 total_frame = tk.Frame(cart_frame, bg="#fdfdfd", pady=10)
 total_frame.pack(fill="x")
 
 total_label = tk.Label(total_frame, text="Total: Rs.0", font=("Segoe UI", 12, "bold"), bg="#fdfdfd")
 total_label.pack(side="right")
+update_cart_total()
 
 order_btn = tk.Button(cart_frame, text="Order Now", font=("Segoe UI", 12, "bold"), bg="#4CAF50", fg="white", relief="flat", cursor="hand2", padx=15, pady=5, activebackground="#45a049", command=place_order)
 order_btn.pack(pady=10, fill="x")
 
+order_status_label = tk.Label(cart_frame, text="", font=("Segoe UI", 10), bg="#fdfdfd", fg="#4CAF50", wraplength=220)
+order_status_label.pack(fill="x")
+
+metrics_label = tk.Label(cart_frame, text="", font=("Segoe UI", 8), bg="#fdfdfd", fg="#888")
+metrics_label.pack(fill="x")
+
+order_queue = OrderQueue(workers=ORDER_WORKERS)
+order_queue.start()
+drain_order_updates()
+root.protocol("WM_DELETE_WINDOW", on_close)
+
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""Menu search index for search-as-you-type"""
+
+
+class MenuIndex:
+    """Finds menu items by name and category without scanning the menu.
+
+    Every prefix of every suffix of the words of the lowercase item names is
+    a key of substrings, mapping to the positions of the items containing it,
+    a flattened prefix trie of the words' suffixes, so a word of the query
+    matches anywhere inside a word as the old substring scan did. Items are
+    also bucketed by category. A lookup intersects the sets of the query's
+    words with the category bucket, smallest first, so its cost follows the
+    number of matches rather than the size of the menu.
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.names = []          # lowercase names, by item position
+        self.substrings = {}     # substring of a word -> set of positions
+        self.categories = {}     # category -> set of positions
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        """Index one more menu item"""
+        position = len(self.items)
+        name = item["name"].lower()
+        self.items.append(item)
+        self.names.append(name)
+        self.categories.setdefault(item["category"], set()).add(position)
+        for word in set(name.split()):
+            for start in range(len(word)):
+                for end in range(start + 1, len(word) + 1):
+                    self.substrings.setdefault(word[start:end], set()).add(position)
+
+    def search(self, query="", category="All"):
+        """Items whose name contains query, in menu order, of one category unless "All" """
+        words = query.lower().split()
+        sets = [self.substrings.get(word, set()) for word in words]
+        if category != "All":
+            sets.append(self.categories.get(category, set()))
+        if not sets:
+            return list(self.items)
+
+        sets.sort(key=len)
+        matches = sets[0].intersection(*sets[1:])
+        if len(words) > 1:
+            # The words must also appear in this order, as one phrase of the name
+            phrase = " ".join(words)
+            matches = [position for position in matches if phrase in self.names[position]]
+        return [self.items[position] for position in sorted(matches)]
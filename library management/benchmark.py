@@ -0,0 +1,330 @@
+"""Headless performance benchmarks for LibraryApp.
+
+Each catalog size runs in its own process against a synthetic catalog in a
+temporary directory, so peak RSS is measured per size. The Tk root stays
+withdrawn; pass --visible (e.g. under xvfb-run on a server) to map the window
+so the grid materializes as many cards as a real screen would show.
+
+    python benchmark.py run --sizes 1000 10000 100000 --output results.json
+    python benchmark.py compare baseline.json results.json --threshold 0.2
+    python benchmark.py memory --sizes 10000 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WORDS = ["Silent", "River", "Shadow", "Garden", "Empire", "Winter", "Secret", "Island", "Broken",
+         "Golden", "Night", "Stone", "Glass", "Forgotten", "City", "Star", "Ocean", "Fire", "Crown", "Dream"]
+SURNAMES = ["Smith", "Garcia", "Tanaka", "Okafor", "Novak", "Larsen", "Haddad", "Kowalski", "Silva", "Chen"]
+CATEGORIES = ["Fiction", "Sci-Fi", "Fantasy", "Romance", "History", "Science", "Biography", "Mystery"]
+QUERIES = ["", "the", "river", "star", "smith", "glass ci", "zzz", "a"]
+OPERATIONS = ["load_data", "filter_books", "display_all_books", "update_statistics",
+              "update_borrowed_list", "save_data"]
+
+
+def generate_catalog(size, borrowed_ratio=0.3, seed=42):
+    """Synthetic library_data.json structure with size books and their loans"""
+    rng = random.Random(seed)
+    today = datetime.now()
+    books, borrowed = [], []
+    for book_id in range(1, size + 1):
+        book = {
+            "id": book_id,
+            "name": " ".join(rng.sample(WORDS, 3)) + f" {book_id}",
+            "author": f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(SURNAMES)}",
+            "status": "available",
+            "category": rng.choice(CATEGORIES)
+        }
+        if rng.random() < borrowed_ratio:
+            book["status"] = "borrowed"
+            due = today + timedelta(days=rng.randint(-30, 30))
+            borrowed.append({"id": book_id, "name": book["name"], "author": book["author"],
+                             "due_date": due.strftime("%d-%m-%Y")})
+        books.append(book)
+    return {"books": books, "borrowed": borrowed, "next_id": size + 1}
+
+
+def generate_covers(books, count, seed=42):
+    """Write synthetic JPEG covers for the first count books into images/"""
+    from PIL import Image
+    from cover_cache import cover_path
+    rng = random.Random(seed)
+    os.makedirs("images", exist_ok=True)
+    for book in books[:count]:
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", (300, 400), color).save(cover_path(book["name"]), "JPEG")
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def summarize(samples):
+    """Latency percentiles in milliseconds"""
+    ms = sorted(sample * 1000 for sample in samples)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = ms[0]
+    return {"runs": len(ms), "p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "max_ms": ms[-1]}
+
+
+def bench_size(size, repeat, covers, visible):
+    """Drive LibraryApp against a synthetic catalog; returns the result record"""
+    workdir = tempfile.mkdtemp(prefix=f"library-bench-{size}-")
+    os.chdir(workdir)
+    data = generate_catalog(size)
+    with open("library_data.json", "w") as file:
+        json.dump(data, file)
+    if covers:
+        generate_covers(data["books"], min(covers, size))
+
+    import tkinter as tk
+    import library
+
+    root = tk.Tk()
+    if visible:
+        root.geometry("1200x700")
+    else:
+        root.withdraw()
+
+    start = time.perf_counter()
+    app = library.LibraryApp(root)
+    while "interactive" not in app.startup_times:
+        root.update()
+    startup = time.perf_counter() - start
+    if app.stats_labels is None:
+        # Build the lazily created management tab so update_statistics does real work
+        app.setup_management_tab()
+
+    def settle():
+        # Let pending idle work and cover callbacks run, as the event loop would
+        root.update()
+
+    def load_data():
+        app.storage.close()
+        app.load_data()
+
+    def filter_books(query):
+        app.search_var.set(query)
+        app.search_cache.clear()
+        app.displayed_query = None
+        app.filter_books()
+        settle()
+
+    def display_all_books():
+        app.display_all_books()
+        settle()
+
+    def update_statistics():
+        app.update_statistics()
+
+    def update_borrowed_list():
+        app.update_borrowed_list()
+        settle()
+
+    def save_data():
+        app.save_data()
+
+    actions = {
+        "load_data": lambda i: load_data(),
+        "filter_books": lambda i: filter_books(QUERIES[i % len(QUERIES)]),
+        "display_all_books": lambda i: display_all_books(),
+        "update_statistics": lambda i: update_statistics(),
+        "update_borrowed_list": lambda i: update_borrowed_list(),
+        "save_data": lambda i: save_data()
+    }
+
+    operations = {}
+    for name in OPERATIONS:
+        samples = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            actions[name](i)
+            samples.append(time.perf_counter() - start)
+        operations[name] = summarize(samples)
+
+    app.storage.close()
+    app.cover_loader.shutdown()
+    root.destroy()
+    return {
+        "books": size,
+        "loans": len(data["borrowed"]),
+        "covers": min(covers, size),
+        "startup_ms": startup * 1000,
+        "first_paint_ms": app.startup_times.get("first_paint"),
+        "interactive_ms": app.startup_times["interactive"],
+        "peak_rss_bytes": peak_rss_bytes(),
+        "operations": operations
+    }
+
+
+def run(args):
+    """Benchmark every size in a fresh process and collect the results"""
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "sizes": {}
+    }
+    script = os.path.abspath(__file__)
+    for size in args.sizes:
+        command = [sys.executable, script, "single", str(size), "--repeat", str(args.repeat),
+                   "--covers", str(args.covers)]
+        if args.visible:
+            command.append("--visible")
+        env = dict(os.environ, LIBRARY_STORAGE=args.storage)
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        record = json.loads(output.splitlines()[-1])
+        results["sizes"][str(size)] = record
+        print(f"{size:>7} books: startup {record['startup_ms']:.0f} ms, "
+              f"filter p50 {record['operations']['filter_books']['p50_ms']:.1f} ms", file=sys.stderr)
+
+    text = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+def single(args):
+    """Benchmark one size in this process and print its record as JSON"""
+    print(json.dumps(bench_size(args.size, args.repeat, args.covers, args.visible)))
+
+
+def memory(args):
+    """Compare the memory and scan time of plain dicts against the Catalog model"""
+    import gc
+    from catalog import Catalog
+
+    results = {}
+    for size in args.sizes:
+        # Round trip through JSON so strings are not shared, as when loading from disk
+        text = json.dumps(generate_catalog(size))
+        gc.collect()
+        tracemalloc.start()
+
+        base = tracemalloc.get_traced_memory()[0]
+        data = json.loads(text)
+        dict_bytes = tracemalloc.get_traced_memory()[0] - base
+        start = time.perf_counter()
+        dict_matches = sum(1 for book in data["books"] if book["category"] == "Fiction" and book["status"] == "available")
+        dict_scan = time.perf_counter() - start
+        del data
+        gc.collect()
+
+        base = tracemalloc.get_traced_memory()[0]
+        catalog = Catalog.from_dict(json.loads(text))
+        gc.collect()
+        catalog_bytes = tracemalloc.get_traced_memory()[0] - base
+        start = time.perf_counter()
+        catalog_matches = sum(1 for book in catalog.books if book.category == "Fiction" and book.status == "available")
+        catalog_scan = time.perf_counter() - start
+        tracemalloc.stop()
+        assert dict_matches == catalog_matches
+        del catalog
+
+        results[str(size)] = {
+            "dict_bytes": dict_bytes,
+            "catalog_bytes": catalog_bytes,
+            "dict_scan_ms": dict_scan * 1000,
+            "catalog_scan_ms": catalog_scan * 1000
+        }
+        print(f"{size:>7} books: dicts {dict_bytes / 2**20:.1f} MB, catalog {catalog_bytes / 2**20:.1f} MB "
+              f"({catalog_bytes / dict_bytes:.0%}); scan {dict_scan * 1000:.1f} ms vs {catalog_scan * 1000:.1f} ms",
+              file=sys.stderr)
+    print(json.dumps(results, indent=4))
+
+
+def compare(args):
+    """Exit with status 1 if any metric got slower or bigger past the threshold"""
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    regressions = []
+
+    def check(label, old, new):
+        if old is None or new is None or old <= 0:
+            return
+        change = (new - old) / old
+        marker = "REGRESSION" if change > args.threshold else ""
+        print(f"{label:<45} {old:>12.1f} {new:>12.1f} {change:>+8.1%} {marker}")
+        if marker:
+            regressions.append(label)
+
+    for size, old in baseline["sizes"].items():
+        new = current["sizes"].get(size)
+        if new is None:
+            continue
+        check(f"{size} startup_ms", old["startup_ms"], new["startup_ms"])
+        check(f"{size} first_paint_ms", old.get("first_paint_ms"), new.get("first_paint_ms"))
+        if old["peak_rss_bytes"] and new["peak_rss_bytes"]:
+            check(f"{size} peak_rss_mb", old["peak_rss_bytes"] / 2**20, new["peak_rss_bytes"] / 2**20)
+        for name, stats in old["operations"].items():
+            if name in new["operations"]:
+                check(f"{size} {name} {args.metric}", stats[args.metric], new["operations"][name][args.metric])
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LibraryApp with synthetic catalogs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark several catalog sizes")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    run_parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    run_parser.set_defaults(func=run)
+
+    single_parser = commands.add_parser("single", help="benchmark one size in this process")
+    single_parser.add_argument("size", type=int)
+    single_parser.set_defaults(func=single)
+
+    for sub in (run_parser, single_parser):
+        sub.add_argument("--repeat", type=int, default=20, help="runs per operation")
+        sub.add_argument("--covers", type=int, default=0, help="synthetic JPEG covers to generate")
+        sub.add_argument("--visible", action="store_true", help="map the window instead of withdrawing it")
+    run_parser.add_argument("--storage", default="json", choices=["json", "journal", "sqlite"])
+
+    memory_parser = commands.add_parser("memory", help="memory of plain dicts against the Catalog model")
+    memory_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    memory_parser.set_defaults(func=memory)
+
+    compare_parser = commands.add_parser("compare", help="fail if current regressed against baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative increase")
+    compare_parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p90_ms", "p99_ms", "max_ms"])
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Virtualized book grid drawn on the books canvas"""
+
+import tkinter as tk
+from itertools import islice
+
+# Fixed card geometry so any book index maps straight to a canvas position
+CARD_WIDTH = 200
+CARD_HEIGHT = 410
+CARD_PADDING = 15
+CELL_WIDTH = CARD_WIDTH + 2 * CARD_PADDING
+CELL_HEIGHT = CARD_HEIGHT + 2 * CARD_PADDING
+
+# Room below the last row for the "Load more" button
+MORE_HEIGHT = 60
+
+
+class BookCard:
+    """A card widget that can be rebound to any book"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.book = None
+        self.state = None
+        self.cover_name = None
+        self.cover_request = None
+        colors = grid.colors
+
+        self.frame = tk.Frame(grid.canvas, bg=colors["text_light"], padx=10, pady=10,
+                              highlightbackground="#ddd", highlightthickness=1, bd=0,
+                              width=CARD_WIDTH, height=CARD_HEIGHT)
+        self.frame.pack_propagate(False)
+
+        # Cover area: shows either the cover image or the placeholder icon
+        cover_frame = tk.Frame(self.frame, width=150, height=200, bg="#e0e0e0")
+        cover_frame.pack(pady=5)
+        self.cover_label = tk.Label(cover_frame, font=("Segoe UI", 36), bg="#e0e0e0", bd=0)
+        self.cover_label.place(relx=0, rely=0, relwidth=1, relheight=1)
+
+        self.title_label = tk.Label(self.frame, font=("Segoe UI", 12, "bold"), bg=colors["text_light"],
+                                    wraplength=150, justify="center")
+        self.title_label.pack(pady=(5, 0))
+
+        self.author_label = tk.Label(self.frame, font=("Segoe UI", 10), bg=colors["text_light"], fg="#555")
+        self.author_label.pack()
+
+        category_frame = tk.Frame(self.frame, bg=colors["primary"], padx=5, pady=2)
+        category_frame.pack(pady=5)
+        self.category_label = tk.Label(category_frame, font=("Segoe UI", 9),
+                                       bg=colors["primary"], fg=colors["text_light"])
+        self.category_label.pack()
+
+        self.status_label = tk.Label(self.frame, font=("Segoe UI", 10, "bold"),
+                                     fg=colors["text_light"], width=10)
+        self.status_label.pack(pady=5)
+
+        self.action_button = tk.Button(self.frame, font=("Segoe UI", 10, "bold"), fg=colors["text_light"],
+                                       width=15, pady=5, bd=0,
+                                       command=lambda: self.grid.on_borrow(self.book))
+        self.action_button.pack(pady=8)
+
+        self.window = grid.canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+
+    def bind(self, book):
+        """Show book on this card, skipping the work if nothing changed"""
+        state = (book.name, book.author, book.category, book.status)
+        if book is self.book and state == self.state and self.cover_name == book.name:
+            return
+        self.book = book
+        self.state = state
+        colors = self.grid.colors
+
+        # Show the placeholder right away; the cover is swapped in once decoded
+        if self.cover_name != book.name:
+            self.cancel_cover()
+            self.set_cover(None)
+            self.cover_name = book.name
+            self.cover_request = self.grid.load_cover(book, self.on_cover_loaded)
+
+        # Book title with ellipsis for long titles
+        title = book.name
+        if len(title) > 20:
+            title = title[:18] + "..."
+        self.title_label.config(text=title)
+        self.author_label.config(text=f"by {book.author}")
+        self.category_label.config(text=book.category)
+
+        # Status label and action button with appropriate colors
+        available = book.status == "available"
+        self.status_label.config(text="Available" if available else "Borrowed",
+                                 bg=colors["available"] if available else colors["borrowed"])
+        self.action_button.config(text="Borrow Book" if available else "Details",
+                                  bg=colors["secondary"] if available else "#999",
+                                  state="normal" if available else "disabled")
+
+    def on_cover_loaded(self, photo):
+        """Receive the decoded cover requested by bind()"""
+        self.cover_request = None
+        self.set_cover(photo)
+
+    def cancel_cover(self):
+        """Cancel a cover decode that is still in flight"""
+        if self.cover_request is not None:
+            self.grid.cancel_cover(self.cover_request)
+            self.cover_request = None
+            self.cover_name = None
+
+    def set_cover(self, photo):
+        """Show a cover image, or the placeholder when photo is None"""
+        if photo is None:
+            self.cover_label.config(image="", text="📚")
+        else:
+            self.cover_label.config(image=photo, text="")
+        self.cover_label.image = photo  # Keep a reference to prevent garbage collection
+
+    def show_at(self, x, y):
+        """Move the card to a canvas position and make it visible"""
+        self.grid.canvas.coords(self.window, x, y)
+        self.grid.canvas.itemconfigure(self.window, state="normal")
+
+    def hide(self):
+        """Hide the card so it can be reused, dropping its pending cover"""
+        self.cancel_cover()
+        self.grid.canvas.itemconfigure(self.window, state="hidden")
+
+
+class VirtualBookGrid:
+    """Grid of book cards that only materializes the rows in view.
+
+    Cards are recycled from a pool as the canvas scrolls or the book list
+    changes, so the widget count depends on the viewport size rather than
+    on the number of books shown. With cards_per_pass, at most that many new
+    cards are created per refresh and the rest follow on idle callbacks, so
+    the window can paint before the first screenful is complete.
+
+    The books can come from a lazy iterable, which is consumed page_size books
+    at a time: the next page loads when the user scrolls near the end of what
+    is loaded or clicks "Load more".
+    """
+
+    def __init__(self, canvas, scrollbar, colors, on_borrow, load_cover, cancel_cover, overscan_rows=1,
+                 cards_per_pass=None, page_size=60):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.colors = colors
+        self.on_borrow = on_borrow
+        self.load_cover = load_cover
+        self.cancel_cover = cancel_cover
+        self.overscan_rows = overscan_rows
+        self.cards_per_pass = cards_per_pass
+        self.page_size = page_size
+
+        self.books = []        # books loaded so far
+        self.results = iter(())
+        self.total = 0
+        self.exhausted = True
+        self.columns = 1
+        self.bound = {}        # book index -> card showing it
+        self.free_cards = []   # hidden cards ready for reuse
+        self.previous = {}     # book id -> card released by set_books, preferred for the same book
+        self.pending_fill = None
+
+        self.message_item = canvas.create_text(0, 0, text="No books found", font=("Segoe UI", 14, "italic"),
+                                               fill="#888", anchor="n", state="hidden")
+        self.more_button = tk.Button(canvas, text="Load more", font=("Segoe UI", 10, "bold"),
+                                     bg=colors["primary"], fg=colors["text_light"], padx=20, pady=5, bd=0,
+                                     command=self.load_more)
+        self.more_window = canvas.create_window(0, 0, window=self.more_button, anchor="n", state="hidden")
+
+        # Every view change (scroll, resize, new scrollregion) goes through yscrollcommand
+        canvas.configure(yscrollcommand=self.on_view_change)
+        canvas.bind("<Configure>", self.on_canvas_configure)
+
+    def set_books(self, books, keep_scroll=False, total=None):
+        """Replace the books shown in the grid.
+
+        books may be a list or a lazy iterable whose length is total. With
+        keep_scroll the view stays where it is, as many books as before are
+        loaded again and cards already showing a book keep showing it, so a
+        small change only touches a few cards.
+        """
+        loaded = len(self.books) if keep_scroll else 0
+        self.results = iter(books)
+        self.total = len(books) if total is None else total
+        self.books = []
+        self.exhausted = False
+        self.load_page(max(self.page_size, loaded))
+
+        # Cards keep their widgets; only the binding to a position is dropped
+        self.previous = {card.book.id: card for card in self.bound.values()}
+        self.bound.clear()
+
+        if not keep_scroll:
+            self.canvas.yview_moveto(0)
+        self.update_layout()
+
+        for card in self.previous.values():
+            card.hide()
+            self.free_cards.append(card)
+        self.previous = {}
+
+    def patch_book(self, book):
+        """Redraw the card showing book, if it is in view"""
+        for card in self.bound.values():
+            if card.book.id == book.id:
+                card.bind(book)
+
+    def load_page(self, count):
+        """Pull up to count more books from the results"""
+        page = list(islice(self.results, count))
+        self.books.extend(page)
+        if len(page) < count or len(self.books) >= self.total:
+            self.exhausted = True
+
+    def load_more(self):
+        """Load the next page and show it"""
+        if not self.exhausted:
+            self.load_page(self.page_size)
+            self.update_layout()
+
+    def update_layout(self):
+        """Recompute columns and the scroll region, then refresh visible rows"""
+        width = max(self.canvas.winfo_width(), 1)
+        self.columns = max(1, width // CELL_WIDTH)
+        rows = -(-len(self.books) // self.columns)
+        height = rows * CELL_HEIGHT
+        if self.exhausted:
+            self.canvas.itemconfigure(self.more_window, state="hidden")
+        else:
+            self.canvas.coords(self.more_window, self.columns * CELL_WIDTH // 2, height + CARD_PADDING)
+            self.canvas.itemconfigure(self.more_window, state="normal")
+            height += MORE_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, self.columns * CELL_WIDTH, height))
+
+        if self.books:
+            self.canvas.itemconfigure(self.message_item, state="hidden")
+        else:
+            self.canvas.coords(self.message_item, width // 2, 70)
+            self.canvas.itemconfigure(self.message_item, state="normal")
+
+        # Positions depend on the column count, so move every bound card
+        for index, card in self.bound.items():
+            card.show_at(*self.position(index))
+        self.refresh()
+
+    def position(self, index):
+        """Canvas coordinates of the card at a book index"""
+        row, col = divmod(index, self.columns)
+        return col * CELL_WIDTH + CARD_PADDING, row * CELL_HEIGHT + CARD_PADDING
+
+    def visible_range(self):
+        """Book indexes in the viewport plus the overscan rows"""
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first_row = max(0, int(top // CELL_HEIGHT) - self.overscan_rows)
+        last_row = int((top + height) // CELL_HEIGHT) + self.overscan_rows
+        return range(first_row * self.columns, min(len(self.books), (last_row + 1) * self.columns))
+
+    def refresh(self):
+        """Bind cards to the visible books and release the rest to the pool"""
+        visible = self.visible_range()
+
+        # Scrolled near the end of the loaded books: pull the next page
+        near_end = visible.stop + self.columns * (self.overscan_rows + 1) >= len(self.books)
+        if near_end and not self.exhausted and self.canvas.canvasy(0) > 0:
+            self.load_more()
+            return
+
+        for index in [index for index in self.bound if index not in visible]:
+            card = self.bound.pop(index)
+            card.hide()
+            self.free_cards.append(card)
+
+        created = 0
+        for index in visible:
+            if index in self.bound:
+                continue
+            book = self.books[index]
+            card = self.previous.pop(book.id, None)
+            if card is None and self.free_cards:
+                card = self.free_cards.pop()
+            if card is None:
+                if self.cards_per_pass is not None and created >= self.cards_per_pass:
+                    # Create the remaining cards once Tk has had a chance to paint
+                    if self.pending_fill is None:
+                        self.pending_fill = self.canvas.after_idle(self.continue_fill)
+                    break
+                card = BookCard(self)
+                created += 1
+            card.bind(book)
+            card.show_at(*self.position(index))
+            self.bound[index] = card
+
+    @property
+    def filling(self):
+        """True while cards for the visible rows are still being created"""
+        return self.pending_fill is not None
+
+    def continue_fill(self):
+        """Idle callback: create the next batch of cards"""
+        self.pending_fill = None
+        self.refresh()
+
+    def on_view_change(self, first, last):
+        """Keep the scrollbar in sync and materialize newly exposed rows"""
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def on_canvas_configure(self, event):
+        """Reflow the grid when the canvas is resized"""
+        if max(1, event.width // CELL_WIDTH) != self.columns:
+            self.update_layout()
+        else:
+            self.refresh()
@@ -0,0 +1,212 @@
+"""Streaming bulk import of books from CSV, JSON lines or JSON files.
+
+Records need "name", "author" and "category" fields and may have a "cover"
+field with the path of a cover image. A .json file may also hold an array of
+records or a {"books": [...]} document such as an exported library_data.json;
+those are read whole rather than streamed. Records are read in batches; the cover
+images of a batch are resized in a process pool, then the whole batch is
+added to the catalog and persisted at once. After each persisted batch a
+checkpoint records how many records are done, so an interrupted import
+resumes where it stopped. A crash between persisting a batch and writing its
+checkpoint imports that one batch again.
+
+    python bulk_import.py books.csv [--batch-size 1000] [--workers 4] [--storage json|journal|sqlite]
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cover_cache import cover_path, COVER_SIZE
+from storage import open_storage, write_text_atomic
+from catalog import Catalog
+
+REQUIRED_FIELDS = ("name", "author", "category")
+
+
+def read_json_document(path):
+    """Return the records of a .json file holding one JSON document, or None for JSON lines"""
+    with open(path, "r", encoding="utf-8") as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError:
+            return None
+    if isinstance(data, dict):
+        # A library_data.json export, or a JSON lines file with a single record
+        data = data.get("books", [data])
+    return data if isinstance(data, list) else None
+
+
+def iter_records(path):
+    """Yield the records of a CSV, JSON lines or JSON file one at a time"""
+    if path.lower().endswith(".json"):
+        records = read_json_document(path)
+        if records is not None:
+            yield from records
+            return
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def count_records(path):
+    """Cheap pass counting the records of a file, for progress reporting"""
+    if path.lower().endswith(".json"):
+        records = read_json_document(path)
+        if records is not None:
+            return len(records)
+    with open(path, "rb") as file:
+        lines = sum(1 for line in file if line.strip())
+    return lines - 1 if path.lower().endswith(".csv") else lines
+
+
+def resize_cover(source, dest):
+    """Worker process: save source resized to the card cover size as dest"""
+    from PIL import Image
+    try:
+        img = Image.open(source)
+        img = img.convert("RGB").resize(COVER_SIZE, Image.Resampling.LANCZOS)
+        img.save(dest, "JPEG")
+        return None
+    except Exception as e:
+        return f"{source}: {e}"
+
+
+class BulkImporter:
+    """Imports a file into a catalog batch by batch.
+
+    commit(records) is called with each batch of valid records and must add
+    them to the catalog and persist them before returning; the importer
+    itself never touches the catalog, so commit can hand the batch to the Tk
+    thread.
+    """
+
+    def __init__(self, path, commit, batch_size=1000, workers=None, checkpoint_path=None):
+        self.path = os.path.abspath(path)
+        self.commit = commit
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_path = checkpoint_path or self.path + ".checkpoint"
+        self.done = 0
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+        self.cancelled = False
+
+    def load_checkpoint(self):
+        """Return how many records a previous run already imported"""
+        try:
+            with open(self.checkpoint_path, "r") as file:
+                checkpoint = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        if checkpoint.get("source") != self.path or checkpoint.get("size") != os.path.getsize(self.path):
+            return 0
+        return checkpoint.get("done", 0)
+
+    def save_checkpoint(self):
+        write_text_atomic(self.checkpoint_path, json.dumps({
+            "source": self.path,
+            "size": os.path.getsize(self.path),
+            "done": self.done
+        }))
+
+    def cancel(self):
+        """Stop after the batch in progress; the checkpoint allows resuming"""
+        self.cancelled = True
+
+    def run(self, progress=None):
+        """Import the file; progress(done, total) is called after each batch"""
+        total = count_records(self.path)
+        self.done = self.load_checkpoint()
+        records = islice(iter_records(self.path), self.done, None)
+
+        # spawn keeps worker processes independent of the threads and Tk state of the parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            while not self.cancelled:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    break
+                valid = self.validate(batch)
+                self.process_covers(pool, valid)
+                self.commit(valid)
+                self.done += len(batch)
+                self.imported += len(valid)
+                self.save_checkpoint()
+                if progress is not None:
+                    progress(self.done, total)
+
+        if not self.cancelled and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.imported
+
+    def validate(self, batch):
+        """Keep the records that have every required field"""
+        valid = []
+        for record in batch:
+            values = {field: str(record.get(field) or "").strip() for field in REQUIRED_FIELDS}
+            if all(values.values()):
+                values["cover"] = str(record.get("cover") or "").strip()
+                valid.append(values)
+            else:
+                self.skipped += 1
+        return valid
+
+    def process_covers(self, pool, records):
+        """Resize the covers of a batch across the process pool"""
+        jobs = [(record["cover"], cover_path(record["name"])) for record in records if record["cover"]]
+        if not jobs:
+            return
+        os.makedirs("images", exist_ok=True)
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        for error in pool.map(resize_cover, *zip(*jobs), chunksize=chunksize):
+            if error is not None:
+                self.errors.append(error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import books into the library catalog")
+    parser.add_argument("path", help="CSV, JSON lines or JSON file with name, author, category and optional cover")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="cover resize processes (default: all cores)")
+    parser.add_argument("--storage", default=os.environ.get("LIBRARY_STORAGE", "json"),
+                        choices=["json", "journal", "sqlite"])
+    args = parser.parse_args()
+
+    storage = open_storage(args.storage)
+    catalog = storage.load() or Catalog()
+    storage.attach(catalog)
+
+    def commit(records):
+        # One prepare/write per batch: one file rewrite, fsync or transaction
+        first = storage.reserve_ids(len(records))
+        if first is not None:
+            catalog.next_id = first
+        books = [catalog.new_book(record["name"], record["author"], record["category"]) for record in records]
+        storage.write(storage.prepare([("add", book) for book in books]))
+
+    def progress(done, total):
+        print(f"\r{done}/{total} records", end="", file=sys.stderr, flush=True)
+
+    importer = BulkImporter(args.path, commit, args.batch_size, args.workers)
+    try:
+        importer.run(progress)
+    finally:
+        storage.close()
+    print(f"\nImported {importer.imported} books, skipped {importer.skipped} incomplete records", file=sys.stderr)
+    for error in importer.errors:
+        print(f"Cover error: {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""In-memory library catalog with primary-key indexes"""
+
+import sys
+
+
+class Book:
+    """One book of the catalog.
+
+    __slots__ keeps a book at a fraction of the size of a dict, and the
+    author, category and status strings are interned so books share them.
+    """
+
+    __slots__ = ("id", "name", "author", "category", "status")
+
+    def __init__(self, id, name, author, category, status="available"):
+        self.id = id
+        self.name = name
+        self.author = sys.intern(author)
+        self.category = sys.intern(category)
+        self.status = sys.intern(status)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a book from its library_data.json record"""
+        return cls(data["id"], data["name"], data["author"], data["category"], data["status"])
+
+    def to_dict(self):
+        """Return the library_data.json record"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "author": self.author,
+            "status": self.status,
+            "category": self.category
+        }
+
+
+class Loan:
+    """An active loan; name and author are read from the book it refers to"""
+
+    __slots__ = ("book", "due_date")
+
+    def __init__(self, book, due_date):
+        self.book = book
+        self.due_date = due_date
+
+    @property
+    def id(self):
+        return self.book.id
+
+    @property
+    def name(self):
+        return self.book.name
+
+    @property
+    def author(self):
+        return self.book.author
+
+    def to_dict(self):
+        """Return the library_data.json record, which repeats the book's name and author"""
+        return {
+            "id": self.book.id,
+            "name": self.book.name,
+            "author": self.book.author,
+            "due_date": self.due_date
+        }
+
+
+
+class Catalog:
+    """Books and loans indexed by book id.
+
+    books keeps catalog order, books_by_id finds a book in O(1) and loans maps
+    a book id to its active loan in the order the loans were made, so a
+    return never has to search or shift a list. New ids come from a monotonic
+    counter that is persisted with the data, so ids are never reused.
+
+    Every change is announced to the subscribed listeners as one of
+    ("book_added", book), ("book_changed", book), ("loan_added", loan) or
+    ("loan_removed", loan), so views can patch just what changed. merge()
+    also sends ("status_changed", (book, old status)) for a status that
+    changed without a loan event.
+
+    books and borrowed are records in the library_data.json format; they are
+    kept as Book and Loan objects.
+    """
+
+    def __init__(self, books=(), borrowed=(), next_id=None):
+        self.books = []
+        self.books_by_id = {}
+        self.loans = {}
+        self.next_id = 1
+        self.listeners = []
+        for book in books:
+            self.insert_book(Book.from_dict(book))
+        for loan in borrowed:
+            self.restore_loan(loan)
+        if next_id is not None:
+            self.next_id = max(self.next_id, next_id)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a catalog from the library_data.json structure"""
+        return cls(data.get("books", []), data.get("borrowed", []), data.get("next_id"))
+
+    def to_dict(self):
+        """Return the library_data.json structure"""
+        return {
+            "books": [book.to_dict() for book in self.books],
+            "borrowed": [loan.to_dict() for loan in self.loans.values()],
+            "next_id": self.next_id
+        }
+
+    def copy(self):
+        """Return an independent catalog with the same contents"""
+        data = self.to_dict()
+        return Catalog(data["books"], data["borrowed"], data["next_id"])
+
+    def subscribe(self, listener):
+        """Call listener(event, item) after every change"""
+        self.listeners.append(listener)
+
+    def emit(self, event, item):
+        """Announce a change to every listener"""
+        for listener in self.listeners:
+            listener(event, item)
+
+    @property
+    def borrowed(self):
+        """Active loans in the order they were made"""
+        return self.loans.values()
+
+    def insert_book(self, book):
+        """Add a Book that already has an id; returns False if the id is taken"""
+        if book.id in self.books_by_id:
+            return False
+        self.books.append(book)
+        self.books_by_id[book.id] = book
+        self.next_id = max(self.next_id, book.id + 1)
+        self.emit("book_added", book)
+        return True
+
+    def new_book(self, name, author, category):
+        """Create an available book with the next free id"""
+        book = Book(self.next_id, name, author, category)
+        self.insert_book(book)
+        return book
+
+    def restore_loan(self, record):
+        """Reinstate a loan from its library_data.json record without announcing it"""
+        book = self.books_by_id.get(record["id"])
+        if book is None:
+            # Keep a loan of a book missing from the catalog so it survives a save
+            book = Book(record["id"], record["name"], record["author"], "", "borrowed")
+        else:
+            book.status = "borrowed"
+        loan = Loan(book, record["due_date"])
+        self.loans[book.id] = loan
+        return loan
+
+    def get(self, book_id):
+        """Return the book with book_id, or None"""
+        return self.books_by_id.get(book_id)
+
+    def borrow(self, book_id, due_date):
+        """Lend an available book; returns the new loan, or None if unavailable"""
+        book = self.books_by_id.get(book_id)
+        if book is None or book.status != "available":
+            return None
+        book.status = "borrowed"
+        loan = Loan(book, due_date)
+        self.loans[book_id] = loan
+        self.emit("book_changed", book)
+        self.emit("loan_added", loan)
+        return loan
+
+    def return_book(self, book_id):
+        """End the loan of a book; returns the loan, or None if it was not lent"""
+        loan = self.loans.pop(book_id, None)
+        if loan is None:
+            return None
+        book = self.books_by_id.get(book_id)
+        if book is not None:
+            book.status = "available"
+            self.emit("book_changed", book)
+        self.emit("loan_removed", loan)
+        return loan
+
+    def merge(self, data):
+        """Bring the catalog in line with a newer library_data.json structure.
+
+        Only the books and loans that differ are touched, each announced as
+        the usual change event; returns how many records changed.
+        """
+        changes = 0
+        loans = {record["id"]: record for record in data.get("borrowed", [])}
+        for record in data.get("books", []):
+            if record["id"] in self.books_by_id:
+                continue
+            book = Book.from_dict(record)
+            if book.id in loans:
+                # Added as available; lending it below announces the loan exactly once
+                book.status = "available"
+            self.insert_book(book)
+            changes += 1
+
+        for book_id in [book_id for book_id in self.loans if book_id not in loans]:
+            self.return_book(book_id)
+            changes += 1
+        for book_id, record in loans.items():
+            loan = self.loans.get(book_id)
+            if loan is None:
+                book = self.books_by_id.get(book_id)
+                if book is not None:
+                    book.status = "available"
+                    self.borrow(book_id, record["due_date"])
+                    changes += 1
+            elif loan.due_date != record["due_date"]:
+                loan.due_date = record["due_date"]
+                self.emit("loan_removed", loan)
+                self.emit("loan_added", loan)
+                changes += 1
+
+        # Statuses that no loan explains, as an older file may hold
+        for record in data.get("books", []):
+            book = self.books_by_id[record["id"]]
+            if book.status != record["status"] and book.id not in self.loans:
+                old_status = book.status
+                book.status = sys.intern(record["status"])
+                self.emit("status_changed", (book, old_status))
+                changes += 1
+        self.next_id = max(self.next_id, data.get("next_id") or 1)
+        return changes
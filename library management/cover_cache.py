@@ -0,0 +1,254 @@
+"""Process-wide cache of resized book cover images"""
+
+import os
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Size of the cover shown on a book card
+COVER_SIZE = (150, 200)
+
+# Seconds a looked-up mtime is trusted before the file is stat'ed again
+MTIME_TTL = 2.0
+
+
+def cover_path(name):
+    """Return the path of the cover image for a book name"""
+    image_name = name.lower().replace(' ', '').replace("'", "").replace(",", "").replace(".", "") + ".jpg"
+    return os.path.join("images", image_name)
+
+
+def decode_cover(path, size=COVER_SIZE):
+    """Open and resize a cover image, or return None if it cannot be read.
+
+    Only uses PIL, never Tk, so it is safe to call from worker threads. PIL is
+    imported on first use, so a catalog without covers never loads it.
+    """
+    try:
+        from PIL import Image
+        img = Image.open(path)
+        return img.resize(size, Image.Resampling.LANCZOS)
+    except Exception:
+        return None
+
+
+class CoverCache:
+    """LRU cache of resized PhotoImages keyed by (path, mtime, size).
+
+    Entries are evicted least recently used first once their estimated pixel
+    memory exceeds max_bytes. The mtime of each path, including paths that do
+    not exist, is remembered for MTIME_TTL seconds, so redraws in quick
+    succession do not touch the disk while covers written by another process
+    show up within seconds. Entries of an older mtime are no longer reached
+    and age out of the LRU. invalidate() refreshes a cover at once.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # (path, mtime, size) -> (photo, bytes)
+        self.mtimes = {}               # path -> (mtime or None when there is no cover, checked at)
+        self.unreadable = {}           # path -> mtime of a file that could not be decoded
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def mtime(self, path):
+        """Return the mtime of path, or None if it has no usable cover"""
+        now = time.monotonic()
+        known = self.mtimes.get(path)
+        if known is None or now - known[1] > MTIME_TTL:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            known = self.mtimes[path] = (mtime, now)
+        mtime = known[0]
+        if mtime is not None and self.unreadable.get(path) == mtime:
+            # The same unreadable file is not decoded again until it changes
+            return None
+        return mtime
+
+    def lookup(self, path, size=COVER_SIZE):
+        """Return (found, photo) without decoding anything.
+
+        found is True when the answer is known: either a cached PhotoImage
+        or None for a path without a usable cover.
+        """
+        mtime = self.mtime(path)
+        if mtime is None:
+            self.negative_hits += 1
+            return True, None
+
+        key = (path, mtime, size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True, entry[0]
+
+        self.misses += 1
+        return False, None
+
+    def get(self, path, size=COVER_SIZE):
+        """Return the cover at path resized to size, decoding it if needed"""
+        found, photo = self.lookup(path, size)
+        if found:
+            return photo
+        return self.store(path, size, decode_cover(path, size))
+
+    def store(self, path, size, img):
+        """Turn a decoded image into a cached PhotoImage; must run on the Tk thread"""
+        if img is None:
+            # Unreadable files are remembered like missing ones
+            mtime = self.mtime(path)
+            if mtime is not None:
+                self.unreadable[path] = mtime
+            return None
+        mtime = self.mtime(path)
+        if mtime is None:
+            return None
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(img)
+        self.put((path, mtime, size), photo)
+        return photo
+
+    def put(self, key, photo):
+        """Store a PhotoImage and evict entries beyond the memory budget"""
+        size = key[2]
+        nbytes = size[0] * size[1] * 4
+        old = self.entries.pop(key, None)
+        if old is not None:
+            # Replacing an entry must not count its bytes twice
+            self.total_bytes -= old[1]
+        self.entries[key] = (photo, nbytes)
+        self.total_bytes += nbytes
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the budget is met"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
+
+    def set_budget(self, max_bytes):
+        """Change the memory budget, evicting immediately if needed"""
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def invalidate(self, path):
+        """Forget everything known about path after it was written"""
+        self.mtimes.pop(path, None)
+        self.unreadable.pop(path, None)
+        for key in [key for key in self.entries if key[0] == path]:
+            _, nbytes = self.entries.pop(key)
+            self.total_bytes -= nbytes
+
+    def stats(self):
+        """Return the cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class CoverLoader:
+    """Decodes covers on a thread pool and swaps them in on the Tk thread.
+
+    Workers only run decode_cover(); the decoded images come back through a
+    queue that root.after drains, which is where PhotoImages are created and
+    callbacks run. Requests for a (path, size) already being decoded join
+    that job instead of decoding again, e.g. two books with the same title or
+    a card scrolled away and back. A job whose requests are all cancelled
+    before a worker picks it up is never decoded, and results of requests
+    cancelled later are never delivered.
+    """
+
+    def __init__(self, root, cache, workers=4, poll_ms=30, batch_size=16):
+        self.root = root
+        self.cache = cache
+        self.poll_ms = poll_ms
+        self.batch_size = batch_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cover")
+        self.results = queue.Queue()
+        self.jobs = {}         # (path, size) -> (future, {token: callback})
+        self.pending = {}      # token -> (path, size) of the job it waits for
+        self.next_token = 0
+        self.drain_id = None
+
+    def request(self, path, callback, size=COVER_SIZE):
+        """Deliver the cover at path to callback(photo).
+
+        Cached answers are delivered immediately and None is returned;
+        otherwise the decode is queued and a token for cancel() is returned.
+        """
+        found, photo = self.cache.lookup(path, size)
+        if found:
+            callback(photo)
+            return None
+
+        token = self.next_token
+        self.next_token += 1
+        key = (path, size)
+        job = self.jobs.get(key)
+        if job is None:
+            job = self.jobs[key] = (self.executor.submit(self.decode_job, path, size), {})
+        job[1][token] = callback
+        self.pending[token] = key
+        if self.drain_id is None:
+            self.drain_id = self.root.after(self.poll_ms, self.drain)
+        return token
+
+    def decode_job(self, path, size):
+        """Worker side: decode and hand the result to the Tk thread"""
+        self.results.put((path, size, decode_cover(path, size)))
+
+    def cancel(self, token):
+        """Stop a request; its callback will never be called"""
+        key = self.pending.pop(token, None)
+        if key is None:
+            return
+        future, callbacks = self.jobs[key]
+        callbacks.pop(token, None)
+        # A job already running is kept: its result still warms the cache
+        if not callbacks and future.cancel():
+            del self.jobs[key]
+
+    def drain(self):
+        """Swap in a batch of decoded covers, then reschedule while work is pending"""
+        self.drain_id = None
+        for _ in range(self.batch_size):
+            try:
+                path, size, img = self.results.get_nowait()
+            except queue.Empty:
+                break
+            # Cancelled requests that were already running still warm the cache
+            photo = self.cache.store(path, size, img)
+            _, callbacks = self.jobs.pop((path, size), (None, {}))
+            for token, callback in callbacks.items():
+                del self.pending[token]
+                callback(photo)
+
+        if self.jobs or not self.results.empty():
+            self.drain_id = self.root.after(self.poll_ms, self.drain)
+
+    def shutdown(self):
+        """Drop queued decodes and stop the workers"""
+        if self.drain_id is not None:
+            self.root.after_cancel(self.drain_id)
+            self.drain_id = None
+        self.jobs.clear()
+        self.pending.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared by every part of the app that shows covers
+covers = CoverCache()
@@ -1,12 +1,49 @@
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk
 from datetime import datetime, timedelta
-import json
+from search_index import create_search_index, SearchIndex, QueryCache
+from book_grid import VirtualBookGrid
+from cover_cache import covers, cover_path, CoverLoader, COVER_SIZE
+from storage import open_storage, WriteBehindStorage
+from library_stats import LibraryStats
+from catalog import Catalog
+from bulk_import import BulkImporter
+
+# Delay before a keystroke in the search box triggers filtering
+SEARCH_DEBOUNCE_MS = 150
+
+# Memory budget for decoded cover images
+COVER_CACHE_MB = 64
+
+# Threads decoding cover images off the Tk thread
+COVER_WORKERS = 4
+
+# Where the catalog is kept: "json" (library_data.json), "journal" (library_data.json
+# plus an append-only journal) or "sqlite" (library.db)
+STORAGE_BACKEND = os.environ.get("LIBRARY_STORAGE", "json")
+
+# Fast start paints the header before loading the catalog, builds the management
+# tab on first use and fills the grid across idle callbacks; set to 0 to build eagerly
+FAST_START = os.environ.get("LIBRARY_FAST_START", "1") != "0"
+
+# Book cards created per idle pass while the grid first fills
+CARDS_PER_PASS = 4
+
+# Books shown by the "Best matches" ranked search
+RANKED_RESULTS = 50
+
+# How often to look for changes other instances made to the shared data file
+SYNC_POLL_MS = 1000
 
 class LibraryApp:
     def __init__(self, root):
+        # Startup milestones in ms since construction: first_paint and interactive
+        self.started_at = time.perf_counter()
+        self.startup_times = {}
         self.root = root
         self.root.title("📚 Modern Library Management System")
         self.root.geometry("1200x700")
@@ -24,22 +61,73 @@ class LibraryApp:
             "borrowed": "#FF5722"   # Orange-red
         }
         
+        # Decoded covers are shared across redraws, bounded by COVER_CACHE_MB
+        covers.set_budget(COVER_CACHE_MB * 1024 * 1024)
+        self.cover_loader = CoverLoader(self.root, covers, workers=COVER_WORKERS)
+        
+        # Search pipeline state
+        self.search_cache = QueryCache()
+        self.pending_search = None
+        self.displayed_query = None
+        self.trigram_index = None
+        self.overdue_timer = None
+        
+        # Bulk import state; batches reach the Tk thread through import_queue
+        self.importer = None
+        self.import_queue = queue.Queue()
+        self.batch_update = False
+        
+        # Built lazily: the management tab on first select, the loan rows once idle
+        self.stats_labels = None
+        self.loan_rows = None
+        
+        # Paint the window and header before the catalog is loaded
+        self.root.configure(bg=self.colors["light_bg"])
+        self.create_header()
+        if FAST_START:
+            self.root.update()
+            self.mark_startup("first_paint")
+        
         # Initialize data
         self.load_data()
         
         # Create UI
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Stop background work and close the window"""
+        if self.importer is not None:
+            self.importer.cancel()
+        
+        # Make sure queued changes reach the disk before exiting; when the
+        # storage keeps failing, let the user retry rather than wait it out
+        self.status_label.config(text="Saving changes...")
+        self.save_label.config(text="⟳ Saving...")
+        self.root.update_idletasks()
+        saved = self.storage.status()[0] != "error" and self.storage.flush(10)
+        while not saved:
+            state, detail = self.storage.status()
+            reason = f"\n\n{detail}" if state == "error" else ""
+            if not messagebox.askretrycancel("Unsaved Changes",
+                                             f"Some changes could not be saved yet.{reason}\n\n"
+                                             "Retry to try again, or Cancel to close and discard them."):
+                break
+            self.root.update_idletasks()
+            saved = self.storage.flush(3)
+        
+        self.cover_loader.shutdown()
+        self.storage.close(timeout=1)
+        self.root.destroy()
         
     def load_data(self):
-        """Load books data from file or use default data"""
-        try:
-            with open("library_data.json", "r") as file:
-                data = json.load(file)
-                self.books_data = data.get("books", [])
-                self.borrowed_books = data.get("borrowed", [])
-        except (FileNotFoundError, json.JSONDecodeError):
+        """Load books data from storage or use default data"""
+        # Writes happen on a background thread; mutations must hold self.storage.lock
+        self.storage = WriteBehindStorage(open_storage(STORAGE_BACKEND))
+        self.catalog = self.storage.load()
+        if self.catalog is None:
             # Sample books data as fallback
-            self.books_data = [
+            self.catalog = Catalog([
                 {"id": 1, "name": "The Great Gatsby", "author": "F. Scott Fitzgerald", "status": "available", "category": "Fiction"},
                 {"id": 2, "name": "To Kill a Mockingbird", "author": "Harper Lee", "status": "available", "category": "Fiction"},
                 {"id": 3, "name": "1984", "author": "George Orwell", "status": "available", "category": "Sci-Fi"},
@@ -48,30 +136,54 @@ class LibraryApp:
                 {"id": 6, "name": "Harry Potter", "author": "J.K. Rowling", "status": "available", "category": "Fantasy"},
                 {"id": 7, "name": "The Lord of the Rings", "author": "J.R.R. Tolkien", "status": "available", "category": "Fantasy"},
                 {"id": 8, "name": "The Catcher in the Rye", "author": "J.D. Salinger", "status": "available", "category": "Fiction"}
-            ]
-            self.borrowed_books = []
+            ])
+        self.storage.attach(self.catalog)
+        
+        # Build the search index used by filter_books
+        self.search_index = create_search_index()
+        self.search_index.build(self.catalog.books)
+        
+        # Statistics are kept up to date by each mutation instead of rescanning
+        self.stats = LibraryStats()
+        self.stats.build(self.catalog.books, self.catalog.borrowed)
+        
+        # Views patch themselves from catalog change events
+        self.catalog.subscribe(self.on_catalog_change)
     
     def save_data(self):
-        """Save books data to file"""
-        data = {
-            "books": self.books_data,
-            "borrowed": self.borrowed_books
-        }
-        with open("library_data.json", "w") as file:
-            json.dump(data, file, indent=4)
+        """Save all books data to storage"""
+        self.storage.save_all(self.catalog)
     
     def setup_ui(self):
-        """Create the main UI elements"""
-        self.root.configure(bg=self.colors["light_bg"])
+        """Create the main UI elements below the header"""
+        self.category_menu.config(values=["All"] + sorted(self.stats.categories))
         
         # Create main frames
-        self.create_header()
         self.create_main_content()
         self.create_footer()
         
         # Load initial data
         self.display_all_books()
-        self.update_borrowed_list()
+        if FAST_START:
+            self.root.after_idle(self.update_borrowed_list)
+        else:
+            self.update_borrowed_list()
+            self.mark_startup("first_paint")
+        self.root.after_idle(self.check_interactive)
+        self.root.after(SYNC_POLL_MS, self.sync_shared_data)
+    
+    def mark_startup(self, milestone):
+        """Record a startup milestone once"""
+        if milestone not in self.startup_times:
+            self.startup_times[milestone] = (time.perf_counter() - self.started_at) * 1000
+    
+    def check_interactive(self):
+        """Mark the app interactive once the grid and loan list are filled"""
+        if self.book_grid.filling or self.loan_rows is None:
+            self.root.after_idle(self.check_interactive)
+            return
+        self.mark_startup("interactive")
+        self.status_label.config(text=f"Ready in {self.startup_times['interactive']:.0f} ms")
     
     def create_header(self):
         """Create the header with title and search bar"""
@@ -116,12 +228,12 @@ class LibraryApp:
         
         tk.Label(filter_frame, text="Filter by:", font=("Segoe UI", 10), bg=self.colors["primary"], fg=self.colors["text_light"]).pack(side="left", padx=(0, 5))
         
-        categories = ["All"] + sorted(list(set(book["category"] for book in self.books_data)))
+        # setup_ui fills in the categories once the catalog is loaded
         self.category_var = tk.StringVar(value="All")
         
-        category_menu = ttk.Combobox(filter_frame, textvariable=self.category_var, values=categories, state="readonly", width=15)
-        category_menu.pack(side="left")
-        category_menu.bind("<<ComboboxSelected>>", lambda e: self.filter_books())
+        self.category_menu = ttk.Combobox(filter_frame, textvariable=self.category_var, values=["All"], state="readonly", width=15)
+        self.category_menu.pack(side="left")
+        self.category_menu.bind("<<ComboboxSelected>>", lambda e: self.filter_books())
         
         # Status filter
         tk.Label(filter_frame, text="Status:", font=("Segoe UI", 10), bg=self.colors["primary"], fg=self.colors["text_light"]).pack(side="left", padx=(20, 5))
@@ -130,6 +242,14 @@ class LibraryApp:
         status_menu = ttk.Combobox(filter_frame, textvariable=self.status_var, values=["All", "Available", "Borrowed"], state="readonly", width=15)
         status_menu.pack(side="left")
         status_menu.bind("<<ComboboxSelected>>", lambda e: self.filter_books())
+        
+        # Ranked mode: best matches first, tolerant of typos
+        self.ranked_var = tk.BooleanVar(value=False)
+        ranked_check = tk.Checkbutton(filter_frame, text="Best matches", variable=self.ranked_var, 
+                                      font=("Segoe UI", 10), bg=self.colors["primary"], fg=self.colors["text_light"], 
+                                      selectcolor=self.colors["primary"], activebackground=self.colors["primary"], 
+                                      command=self.filter_books)
+        ranked_check.pack(side="left", padx=(20, 0))
     
     def create_main_content(self):
         """Create the main content area with books display and borrowed books panel"""
@@ -151,18 +271,15 @@ class LibraryApp:
         # Create a canvas with scrollbar
         self.books_canvas = tk.Canvas(books_outer_frame, bg=self.colors["light_bg"])
         scrollbar = ttk.Scrollbar(books_outer_frame, orient="vertical", command=self.books_canvas.yview)
-        self.books_canvas.configure(yscrollcommand=scrollbar.set)
         
         scrollbar.pack(side="right", fill="y")
         self.books_canvas.pack(side="left", fill="both", expand=True)
         
-        # Create a frame inside the canvas for the books
-        self.books_frame = tk.Frame(self.books_canvas, bg=self.colors["light_bg"])
-        self.books_canvas_window = self.books_canvas.create_window((0, 0), window=self.books_frame, anchor="nw")
-        
-        # Configure the canvas to adjust with resizing
-        self.books_frame.bind("<Configure>", self.on_books_frame_configure)
-        self.books_canvas.bind("<Configure>", self.on_books_canvas_configure)
+        # The grid only creates cards for the rows in view and recycles them while scrolling
+        self.book_grid = VirtualBookGrid(self.books_canvas, scrollbar, self.colors,
+                                         on_borrow=self.borrow_book, load_cover=self.load_cover,
+                                         cancel_cover=self.cover_loader.cancel,
+                                         cards_per_pass=CARDS_PER_PASS if FAST_START else None)
         self.books_canvas.bind_all("<MouseWheel>", self.on_mousewheel)
         
         # Create the borrowed books frame
@@ -201,8 +318,16 @@ class LibraryApp:
         self.manage_tab = tk.Frame(self.content_frame, bg=self.colors["light_bg"])
         self.content_frame.add(self.manage_tab, text="Manage Library")
         
-        # Set up the management tab
-        self.setup_management_tab()
+        # Set up the management tab, or wait until it is first selected
+        if FAST_START:
+            self.content_frame.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        else:
+            self.setup_management_tab()
+    
+    def on_tab_changed(self, event):
+        """Build the management tab the first time it is selected"""
+        if self.stats_labels is None and self.content_frame.select() == str(self.manage_tab):
+            self.setup_management_tab()
     
     def setup_management_tab(self):
         """Set up the library management tab"""
@@ -258,6 +383,22 @@ class LibraryApp:
                           padx=20, pady=5, command=self.add_new_book)
         add_btn.pack(pady=20)
         
+        # Bulk import from a CSV or JSON lines file
+        import_frame = tk.Frame(add_frame, bg=self.colors["light_bg"])
+        import_frame.pack(fill="x", pady=5)
+        
+        self.import_btn = tk.Button(import_frame, text="Bulk Import...", font=("Segoe UI", 10), 
+                                    bg=self.colors["primary"], fg=self.colors["text_light"],
+                                    command=self.start_bulk_import)
+        self.import_btn.pack(side="left")
+        
+        self.import_progress = ttk.Progressbar(import_frame, mode="determinate", length=200)
+        self.import_progress.pack(side="left", padx=10, fill="x", expand=True)
+        
+        self.import_label = tk.Label(add_frame, text="", font=("Segoe UI", 9), 
+                                     bg=self.colors["light_bg"], fg="#555")
+        self.import_label.pack(anchor="w")
+        
         # Right column - Statistics
         stats_frame = tk.LabelFrame(management_frame, text="Library Statistics", font=("Segoe UI", 12), 
                                   bg=self.colors["light_bg"], fg=self.colors["primary"], padx=15, pady=15)
@@ -270,7 +411,8 @@ class LibraryApp:
             ("Available Books:", "available_books"),
             ("Borrowed Books:", "borrowed_books"),
             ("Overdue Books:", "overdue_books"),
-            ("Most Popular Category:", "popular_category")
+            ("Most Popular Category:", "popular_category"),
+            ("Cover Cache:", "cover_cache")
         ]
         
         for i, (label_text, key) in enumerate(stats):
@@ -309,18 +451,34 @@ class LibraryApp:
         date_label = tk.Label(footer_frame, text=date_str, font=("Segoe UI", 9), 
                             bg=self.colors["dark_bg"], fg=self.colors["text_light"])
         date_label.pack(side="right", padx=10)
+        
+        # Save state of the background writer
+        self.save_label = tk.Label(footer_frame, text="✔ Saved", font=("Segoe UI", 9), 
+                                 bg=self.colors["dark_bg"], fg=self.colors["text_light"])
+        self.save_label.pack(side="right", padx=10)
+        self.update_save_indicator()
     
-    def on_books_frame_configure(self, event):
-        """Update the scrollregion when the books frame size changes"""
-        self.books_canvas.configure(scrollregion=self.books_canvas.bbox("all"))
-    
-    def on_books_canvas_configure(self, event):
-        """Resize the books frame width when the canvas size changes"""
-        self.books_canvas.itemconfig(self.books_canvas_window, width=event.width)
+    def update_save_indicator(self):
+        """Show whether changes are unsaved, being saved or saved"""
+        state, detail = self.storage.status()
+        if state == "saving":
+            text, color = "⟳ Saving...", self.colors["text_light"]
+        elif state == "unsaved":
+            text, color = f"● {detail} unsaved change{'s' if detail != 1 else ''}", self.colors["accent"]
+        elif state == "error":
+            text, color = f"⚠ Save failed: {detail}", self.colors["borrowed"]
+        elif detail is None:
+            text, color = "✔ Saved", self.colors["text_light"]
+        else:
+            text, color = f"✔ Saved ({detail * 1000:.0f} ms)", self.colors["text_light"]
+        self.save_label.config(text=text, fg=color)
+        self.root.after(250, self.update_save_indicator)
     
     def on_mousewheel(self, event):
         """Handle mousewheel scrolling"""
-        if self.books_canvas.winfo_containing(event.x_root, event.y_root) == self.books_canvas:
+        # Cards are children of the canvas, so scroll when the pointer is over any of them too
+        widget = self.books_canvas.winfo_containing(event.x_root, event.y_root)
+        if widget is not None and str(widget).startswith(str(self.books_canvas)):
             self.books_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
     
     def clear_search(self):
@@ -329,40 +487,106 @@ class LibraryApp:
         self.filter_books()
     
     def on_search_change(self, sv):
-        """Respond to search field changes"""
-        self.filter_books()
+        """Respond to search field changes once typing pauses"""
+        if self.pending_search is not None:
+            self.root.after_cancel(self.pending_search)
+        self.pending_search = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_books)
     
-    def filter_books(self):
+    def on_catalog_change(self, event, item):
+        """Keep indexes, statistics and views in step with one catalog change"""
+        # Any change can alter some cached result
+        self.search_cache.clear()
+        
+        if event == "book_added":
+            self.search_index.add_book(item)
+            if self.trigram_index is not None:
+                self.trigram_index.add_book(item)
+            self.stats.book_added(item)
+            if self.stats.categories[item.category] == 1:
+                self.category_menu.config(values=["All"] + sorted(self.stats.categories))
+            if self.batch_update:
+                # apply_import_batch refreshes the views once for the whole batch
+                return
+            self.refresh_books_view()
+        elif event in ("book_changed", "status_changed"):
+            if event == "status_changed":
+                # No loan event follows, so the counters move here
+                item, old_status = item
+                self.stats.status_changed(old_status, item.status)
+            self.search_index.update_status(item)
+            if self.trigram_index is not None:
+                self.trigram_index.update_status(item)
+            if self.status_var.get() == "All":
+                # Only the status of the card changes, membership in the results does not
+                self.book_grid.patch_book(item)
+            else:
+                self.refresh_books_view()
+        elif event == "loan_added":
+            self.stats.book_borrowed(item)
+            self.add_loan_row(item)
+        elif event == "loan_removed":
+            self.stats.book_returned(item.id)
+            self.remove_loan_row(item.id)
+        
+        self.update_statistics()
+    
+    def refresh_books_view(self):
+        """Re-run the current filter without losing the scroll position"""
+        self.displayed_query = None
+        self.filter_books(keep_scroll=True)
+    
+    def filter_books(self, keep_scroll=False):
         """Filter books based on search query, category and status"""
+        # A direct call supersedes any keystroke still waiting to fire
+        if self.pending_search is not None:
+            self.root.after_cancel(self.pending_search)
+            self.pending_search = None
+        
         query = self.search_var.get().lower()
         category = self.category_var.get()
         status = self.status_var.get().lower()
         
-        filtered_books = []
-        for book in self.books_data:
-            # Apply search filter
-            search_match = (query == "" or 
-                          query in book["name"].lower() or 
-                          query in book["author"].lower())
-            
-            # Apply category filter
-            category_match = (category == "All" or book["category"] == category)
-            
-            # Apply status filter
-            status_match = (status == "all" or 
-                          (status == "available" and book["status"] == "available") or 
-                          (status == "borrowed" and book["status"] == "borrowed"))
-            
-            if search_match and category_match and status_match:
-                filtered_books.append(book)
+        # Ranked search needs a few characters to compare trigrams
+        ranked = self.ranked_var.get() and len(query) >= 3
         
-        self.display_all_books(filtered_books)
+        # Reuse the ranked ids or the count of an earlier identical query if the catalog is unchanged
+        key = (query, category, status, ranked)
+        result = self.search_cache.get(key)
+        if result is None:
+            if ranked:
+                result = tuple(self.get_trigram_index().ranked(query, category, status, RANKED_RESULTS))
+            else:
+                result = self.search_index.count(query, category, status)
+            self.search_cache.put(key, result)
+        count = len(result) if ranked else result
+        
+        # Skip the redraw when the grid already shows this query
+        if key != self.displayed_query:
+            books_by_id = self.catalog.books_by_id
+            if ranked:
+                self.display_all_books([books_by_id[book_id] for book_id in result], keep_scroll)
+            else:
+                # The grid pulls matches from this generator a page at a time
+                matches = (books_by_id[book_id] for book_id in self.search_index.iter_search(query, category, status))
+                self.display_all_books(matches, keep_scroll, total=count)
+            self.displayed_query = key
         
         # Update status message
-        if len(filtered_books) == 0:
+        if count == 0:
             self.status_label.config(text="No books match your search criteria")
+        elif ranked:
+            self.status_label.config(text=f"Showing the {count} best matches")
         else:
-            self.status_label.config(text=f"Found {len(filtered_books)} books")
+            self.status_label.config(text=f"Found {count} books")
+    
+    def get_trigram_index(self):
+        """Trigram index for ranked search, built on first use if filtering uses NumPy"""
+        if isinstance(self.search_index, SearchIndex):
+            return self.search_index
+        if self.trigram_index is None:
+            self.trigram_index = SearchIndex()
+            self.trigram_index.build(self.catalog.books)
+        return self.trigram_index
     
     def browse_image(self):
         """Open file dialog to select a book cover image"""
@@ -383,16 +607,6 @@ class LibraryApp:
             messagebox.showwarning("Missing Information", "Please fill in all required fields.")
             return
         
-        # Create new book entry
-        new_id = max([book.get("id", 0) for book in self.books_data], default=0) + 1
-        new_book = {
-            "id": new_id,
-            "name": name,
-            "author": author,
-            "category": category,
-            "status": "available"
-        }
-        
         # Handle image
         if image_path:
             # Create images directory if it doesn't exist
@@ -401,20 +615,21 @@ class LibraryApp:
             
             # Copy image to images folder with appropriate name
             try:
-                image_filename = f"{name.lower().replace(' ', '').replace(',', '').replace('.', '')}.jpg"
-                image_dest = os.path.join("images", image_filename)
+                image_dest = cover_path(name)
                 
+                from PIL import Image
                 img = Image.open(image_path)
-                img = img.resize((150, 200), Image.Resampling.LANCZOS)
+                img = img.resize(COVER_SIZE, Image.Resampling.LANCZOS)
                 img.save(image_dest)
+                covers.invalidate(image_dest)
             except Exception as e:
                 messagebox.showwarning("Image Error", f"Could not process image: {str(e)}")
         
-        # Add book and update display
-        self.books_data.append(new_book)
-        self.save_data()
-        self.display_all_books()
-        self.update_statistics()
+        # Add book; the display updates itself from the catalog event
+        with self.storage.lock:
+            self.reserve_book_ids(1)
+            new_book = self.catalog.new_book(name, author, category)
+            self.storage.record_add(new_book)
         
         # Clear fields
         self.name_entry.delete(0, tk.END)
@@ -424,254 +639,309 @@ class LibraryApp:
         
         # Update status
         self.status_label.config(text=f"Added new book: {name}")
-        
-        # Update category dropdown
-        categories = ["All"] + sorted(list(set(book["category"] for book in self.books_data)))
-        ttk.Combobox(values=categories)
     
-    def update_statistics(self):
-        """Update the statistics labels"""
-        total = len(self.books_data)
-        available = sum(1 for book in self.books_data if book["status"] == "available")
-        borrowed = sum(1 for book in self.books_data if book["status"] == "borrowed")
-        
-        # Calculate overdue books
-        overdue = 0
-        today = datetime.now()
-        for book in self.borrowed_books:
-            due_date = datetime.strptime(book["due_date"], "%d-%m-%Y")
-            if due_date < today:
-                overdue += 1
-        
-        # Find most popular category
-        categories = {}
-        for book in self.books_data:
-            cat = book["category"]
-            if cat in categories:
-                categories[cat] += 1
-            else:
-                categories[cat] = 1
+    def start_bulk_import(self):
+        """Import books from a CSV or JSON lines file in the background"""
+        if self.importer is not None:
+            # A second click cancels; the checkpoint lets the next run resume
+            self.importer.cancel()
+            self.import_label.config(text="Stopping after the current batch...")
+            return
+        filetypes = [("Book lists", "*.csv *.jsonl *.json"), ("All files", "*.*")]
+        path = filedialog.askopenfilename(title="Select Books to Import", filetypes=filetypes)
+        if not path:
+            return
         
-        popular_category = max(categories.items(), key=lambda x: x[1])[0] if categories else "None"
+        self.importer = BulkImporter(path, self.commit_import_batch)
+        self.import_btn.config(text="Stop Import")
+        self.import_progress.config(value=0)
+        self.import_label.config(text="Importing...")
         
-        # Update labels
-        self.stats_labels["total_books"].config(text=str(total))
-        self.stats_labels["available_books"].config(text=str(available))
-        self.stats_labels["borrowed_books"].config(text=str(borrowed))
-        self.stats_labels["overdue_books"].config(text=str(overdue))
-        self.stats_labels["popular_category"].config(text=popular_category)
-    
-    def display_all_books(self, display_books=None):
-        """Display all books in the books frame"""
-        # Clear existing books
-        for widget in self.books_frame.winfo_children():
-            widget.destroy()
+        def run(importer=self.importer):
+            try:
+                importer.run(lambda done, total: self.import_queue.put(("progress", done, total)))
+                self.import_queue.put(("finished", importer, None))
+            except Exception as e:
+                self.import_queue.put(("finished", importer, e))
         
-        books_to_display = display_books or self.books_data
+        threading.Thread(target=run, name="library-import", daemon=True).start()
+        self.drain_import_queue()
+    
+    def commit_import_batch(self, records):
+        """Import thread: add a batch on the Tk thread, then wait until it is on disk"""
+        # Reserving ids may wait for another instance's lock, so it happens here
+        first_id = self.storage.reserve_ids(len(records))
+        applied = threading.Event()
+        self.import_queue.put(("batch", records, first_id, applied))
+        applied.wait()
+        self.storage.flush()
+    
+    def drain_import_queue(self):
+        """Apply batches and progress sent by the import thread"""
+        while True:
+            try:
+                message = self.import_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "batch":
+                self.apply_import_batch(message[1], message[2])
+                message[3].set()
+            elif message[0] == "progress":
+                done, total = message[1], message[2]
+                self.import_progress.config(maximum=max(total, 1), value=done)
+                self.import_label.config(text=f"{done} of {total} records")
+            else:
+                self.finish_bulk_import(message[1], message[2])
+                return
+        self.root.after(50, self.drain_import_queue)
+    
+    def apply_import_batch(self, records, first_id=None):
+        """Add one batch of imported books and persist it as a single write"""
+        self.batch_update = True
+        try:
+            with self.storage.lock:
+                if first_id is not None:
+                    self.catalog.next_id = first_id
+                books = [self.catalog.new_book(record["name"], record["author"], record["category"])
+                         for record in records]
+                self.storage.record_batch([("add", book) for book in books])
+        finally:
+            self.batch_update = False
+        
+        for record in records:
+            if record["cover"]:
+                covers.invalidate(cover_path(record["name"]))
+        self.refresh_books_view()
+        self.update_statistics()
+    
+    def finish_bulk_import(self, importer, error):
+        """Report the outcome of a bulk import"""
+        self.importer = None
+        self.import_btn.config(text="Bulk Import...")
+        if error is not None:
+            self.import_label.config(text="Import failed")
+            messagebox.showerror("Import Error", f"Could not import books: {error}")
+            return
         
-        if not books_to_display:
-            # Show no books message
-            msg_frame = tk.Frame(self.books_frame, bg=self.colors["light_bg"], padx=20, pady=20)
-            msg_frame.pack(fill="both", expand=True)
-            
-            tk.Label(msg_frame, text="No books found", font=("Segoe UI", 14, "italic"), 
-                   bg=self.colors["light_bg"], fg="#888").pack(pady=50)
+        summary = f"Imported {importer.imported} books"
+        if importer.skipped:
+            summary += f", skipped {importer.skipped} incomplete records"
+        if importer.errors:
+            summary += f", {len(importer.errors)} covers failed"
+        if importer.cancelled:
+            summary += " (stopped; importing the same file again resumes)"
+        self.import_label.config(text=summary)
+        self.status_label.config(text=summary)
+    
+    def reserve_book_ids(self, count):
+        """Take ids for count new books that no other instance sharing the data will use;
+        served from the block the storage reserved ahead, so this does not wait on disk"""
+        first = self.storage.reserve_ids(count)
+        if first is not None:
+            self.catalog.next_id = first
+    
+    def sync_shared_data(self):
+        """Apply the changes other instances committed to the shared data file"""
+        try:
+            with self.storage.lock:
+                changed = self.storage.poll()
+                if changed is not None:
+                    data, conflicts = changed
+                    changes = 0
+                    if data is not None:
+                        # Books added elsewhere refresh the views once below, not one by one
+                        self.batch_update = True
+                        try:
+                            changes = self.catalog.merge(data)
+                        finally:
+                            self.batch_update = False
+        except OSError as e:
+            self.status_label.config(text=f"Could not read shared data: {e}")
+            changed = None
+        
+        if changed is not None:
+            if changes:
+                self.refresh_books_view()
+                self.update_statistics()
+                self.status_label.config(text=f"Synced {changes} change{'s' if changes != 1 else ''} "
+                                              "from another terminal")
+            if conflicts:
+                messagebox.showwarning("Sync Conflict", "\n".join(conflicts))
+        self.root.after(SYNC_POLL_MS, self.sync_shared_data)
+
+    
+    def update_statistics(self):
+        """Update the statistics labels"""
+        if self.stats_labels is None:
+            # The management tab is not built yet; it fills the labels when it is
+            self.schedule_overdue_check()
             return
         
-        # Calculate how many books can fit in a row based on frame width
-        # Default to 4 books per row, this will be dynamically adjusted on resize
-        books_per_row = 4
+        # Update labels
+        self.stats_labels["total_books"].config(text=str(self.stats.total))
+        self.stats_labels["available_books"].config(text=str(self.stats.available))
+        self.stats_labels["borrowed_books"].config(text=str(self.stats.borrowed))
+        self.stats_labels["overdue_books"].config(text=str(self.stats.overdue_count()))
+        self.stats_labels["popular_category"].config(text=self.stats.popular_category())
         
-        # Create a grid of book cards
-        for i, book in enumerate(books_to_display):
-            row, col = divmod(i, books_per_row)
-            self.create_book_card(book, row, col)
-    
-    def create_book_card(self, book, row, col):
-        """Create a card for a book"""
-        # Create a frame for the book card with a subtle border and shadow effect
-        card = tk.Frame(self.books_frame, bg=self.colors["text_light"], padx=10, pady=10, 
-                      highlightbackground="#ddd", highlightthickness=1, bd=0)
-        card.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
+        cache = covers.stats()
+        self.stats_labels["cover_cache"].config(
+            text=f"{cache['hits']} hits / {cache['misses']} misses ({cache['bytes'] // (1024 * 1024)} MB)")
         
-        # Add cover image
-        try:
-            image_name = book['name'].lower().replace(' ', '').replace("'", "").replace(",", "").replace(".", "") + ".jpg"
-            image_path = os.path.join("images", image_name)
-            
-            if os.path.exists(image_path):
-                img = Image.open(image_path)
-                img = img.resize((150, 200), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                img_label = tk.Label(card, image=photo, bg=self.colors["text_light"])
-                img_label.image = photo  # Keep a reference to prevent garbage collection
-                img_label.pack(pady=5)
-            else:
-                # Create a placeholder
-                placeholder = tk.Frame(card, width=150, height=200, bg="#e0e0e0")
-                placeholder.pack(pady=5)
-                tk.Label(placeholder, text="📚", font=("Segoe UI", 36), bg="#e0e0e0").place(relx=0.5, rely=0.5, anchor="center")
-        except Exception:
-            # Create a placeholder on error
-            placeholder = tk.Frame(card, width=150, height=200, bg="#e0e0e0")
-            placeholder.pack(pady=5)
-            tk.Label(placeholder, text="📚", font=("Segoe UI", 36), bg="#e0e0e0").place(relx=0.5, rely=0.5, anchor="center")
-        
-        # Book title with ellipsis for long titles
-        title = book["name"]
-        if len(title) > 20:
-            title = title[:18] + "..."
-        
-        tk.Label(card, text=title, font=("Segoe UI", 12, "bold"), bg=self.colors["text_light"], 
-               wraplength=150, justify="center").pack(pady=(5, 0))
-        
-        tk.Label(card, text=f"by {book['author']}", font=("Segoe UI", 10), 
-               bg=self.colors["text_light"], fg="#555").pack()
-        
-        # Category label
-        category_frame = tk.Frame(card, bg=self.colors["primary"], padx=5, pady=2)
-        category_frame.pack(pady=5)
-        tk.Label(category_frame, text=book["category"], font=("Segoe UI", 9), 
-               bg=self.colors["primary"], fg=self.colors["text_light"]).pack()
-        
-        # Status label with appropriate color
-        status_color = self.colors["available"] if book["status"] == "available" else self.colors["borrowed"]
-        status_text = "Available" if book["status"] == "available" else "Borrowed"
-        
-        status_label = tk.Label(card, text=status_text, font=("Segoe UI", 10, "bold"), 
-                              bg=status_color, fg=self.colors["text_light"], width=10)
-        status_label.pack(pady=5)
-        
-        # Action button (borrow or view details)
-        button_text = "Borrow Book" if book["status"] == "available" else "Details"
-        button_color = self.colors["secondary"] if book["status"] == "available" else "#999"
-        button_state = "normal" if book["status"] == "available" else "disabled"
-        
-        action_button = tk.Button(card, text=button_text, font=("Segoe UI", 10, "bold"), 
-                                bg=button_color, fg=self.colors["text_light"], 
-                                width=15, pady=5, bd=0,
-                                state=button_state, 
-                                command=lambda: self.borrow_book(book))
-        action_button.pack(pady=8)
+        self.schedule_overdue_check()
+    
+    def schedule_overdue_check(self):
+        """Wake up exactly when the next loan becomes overdue"""
+        if self.overdue_timer is not None:
+            self.root.after_cancel(self.overdue_timer)
+            self.overdue_timer = None
+        
+        next_due = self.stats.next_overdue_at()
+        if next_due is not None:
+            # Cap the delay at a day so clock changes are picked up eventually
+            delay = (next_due - datetime.now()).total_seconds()
+            delay_ms = min(max(int(delay * 1000) + 1, 0), 24 * 60 * 60 * 1000)
+            self.overdue_timer = self.root.after(delay_ms, self.on_overdue_timer)
+    
+    def on_overdue_timer(self):
+        """A loan just became overdue: refresh the counts and highlighting"""
+        self.overdue_timer = None
+        self.update_borrowed_list()
+        self.update_statistics()
+    
+    def display_all_books(self, display_books=None, keep_scroll=False, total=None):
+        """Display all books, or the total books of an iterable, in the books grid"""
+        books_to_display = self.catalog.books if display_books is None else display_books
+        self.book_grid.set_books(books_to_display, keep_scroll, total)
+    
+    def load_cover(self, book, callback):
+        """Deliver a book's cover to callback, decoding it in the background if needed"""
+        return self.cover_loader.request(cover_path(book.name), callback)
     
     def borrow_book(self, book):
         """Borrow a book and update records"""
-        book_id = book["id"]
-        
-        # Find the book in the data
-        for b in self.books_data:
-            if b["id"] == book_id and b["status"] == "available":
-                b["status"] = "borrowed"
-                due_date = datetime.now() + timedelta(days=14)
-                due_date_str = due_date.strftime("%d-%m-%Y")
-                
-                # Add to borrowed books list
-                self.borrowed_books.append({
-                    "id": book_id,
-                    "name": b["name"],
-                    "author": b["author"],
-                    "due_date": due_date_str
-                })
-                
-                # Save data and update UI
-                self.save_data()
-                self.update_borrowed_list()
-                self.display_all_books()
-                self.update_statistics()
-                
-                # Show success message
-                messagebox.showinfo("Success", f"You have borrowed '{b['name']}'\nReturn by: {due_date_str}")
-                self.status_label.config(text=f"Book '{b['name']}' borrowed successfully")
-                return
-                
-        # If we get here, the book is not available
-        messagebox.showinfo("Not Available", f"'{book['name']}' is not available for borrowing.")
+        book_id = book.id
+        due_date = datetime.now() + timedelta(days=14)
+        due_date_str = due_date.strftime("%d-%m-%Y")
+        
+        # Update the book and add its loan; the writer saves it and the views patch themselves
+        with self.storage.lock:
+            loan = self.catalog.borrow(book_id, due_date_str)
+            if loan is not None:
+                self.storage.record_borrow(self.catalog.get(book_id), loan)
+        
+        if loan is None:
+            # The book is not available
+            messagebox.showinfo("Not Available", f"'{book.name}' is not available for borrowing.")
+            return
+        
+        # Show success message
+        messagebox.showinfo("Success", f"You have borrowed '{loan.name}'\nReturn by: {due_date_str}")
+        self.status_label.config(text=f"Book '{loan.name}' borrowed successfully")
     
-    def return_book(self, index):
+    def return_book(self, book_id):
         """Return a borrowed book"""
-        if 0 <= index < len(self.borrowed_books):
-            book_id = self.borrowed_books[index]["id"]
-            book_name = self.borrowed_books[index]["name"]
-            
-            # Update book status
-            for book in self.books_data:
-                if book["id"] == book_id:
-                    book["status"] = "available"
-                    break
-            
-            # Remove from borrowed list
-            self.borrowed_books.pop(index)
-            
-            # Save data and update UI
-            self.save_data()
-            self.update_borrowed_list()
-            self.display_all_books()
-            self.update_statistics()
-            
+        # End the loan; the writer saves it
+        with self.storage.lock:
+            loan = self.catalog.return_book(book_id)
+            if loan is not None:
+                self.storage.record_return(book_id)
+        
+        if loan is not None:
             # Show success message
-            self.status_label.config(text=f"Book '{book_name}' returned successfully")
+            self.status_label.config(text=f"Book '{loan.name}' returned successfully")
     
     def update_borrowed_list(self):
-        """Update the borrowed books list display"""
+        """Rebuild the whole borrowed books list display"""
         # Clear existing content
         for widget in self.borrowed_frame.winfo_children():
             widget.destroy()
+        self.loan_rows = {}
+        self.empty_loans_label = None
         
-        if not self.borrowed_books:
-            # Show empty message
-            empty_label = tk.Label(self.borrowed_frame, text="No borrowed books", 
-                                 font=("Segoe UI", 11, "italic"), bg=self.colors["light_bg"], fg="#888")
-            empty_label.pack(pady=20, padx=10)
+        if not self.catalog.loans:
+            self.show_empty_loans()
         else:
             today = datetime.now()
             
             # Add each borrowed book
-            for i, book in enumerate(self.borrowed_books):
-                # Calculate if overdue
-                due_date = datetime.strptime(book["due_date"], "%d-%m-%Y")
-                is_overdue = due_date < today
-                
-                # Create card with different color if overdue
-                bg_color = "#fff4f4" if is_overdue else self.colors["text_light"]
-                border_color = self.colors["borrowed"] if is_overdue else "#ddd"
-                
-                item_frame = tk.Frame(self.borrowed_frame, bg=bg_color, padx=10, pady=10,
-                                    highlightbackground=border_color, highlightthickness=1)
-                item_frame.pack(fill="x", padx=10, pady=5)
-                
-                # Book info
-                info_frame = tk.Frame(item_frame, bg=bg_color)
-                info_frame.pack(fill="x")
-                
-                tk.Label(info_frame, text=book["name"], font=("Segoe UI", 12, "bold"), 
-                       bg=bg_color, wraplength=200, anchor="w").pack(fill="x")
-                
-                tk.Label(info_frame, text=f"by {book['author']}", font=("Segoe UI", 10), 
-                       bg=bg_color, fg="#555").pack(anchor="w")
-                
-                # Due date with warning if overdue
-                date_frame = tk.Frame(item_frame, bg=bg_color)
-                date_frame.pack(fill="x", pady=(5, 0))
-                
-                date_text = f"Due: {book['due_date']}"
-                date_color = "red" if is_overdue else "#555"
-                date_font = ("Segoe UI", 10, "bold") if is_overdue else ("Segoe UI", 10)
-                
-                tk.Label(date_frame, text=date_text, font=date_font, bg=bg_color, fg=date_color).pack(side="left")
-                
-                if is_overdue:
-                    overdue_days = (today - due_date).days
-                    tk.Label(date_frame, text=f"({overdue_days} days overdue)", 
-                           font=("Segoe UI", 9), bg=bg_color, fg="red").pack(side="left", padx=5)
-                
-                # Return button
-                button_frame = tk.Frame(item_frame, bg=bg_color)
-                button_frame.pack(fill="x", pady=(8, 0))
-                
-                return_btn = tk.Button(button_frame, text="Return Book", font=("Segoe UI", 10), 
-                                      bg=self.colors["secondary"], fg=self.colors["text_light"],
-                                      command=lambda idx=i: self.return_book(idx))
-                return_btn.pack(side="right")
+            for book in self.catalog.borrowed:
+                self.loan_rows[book.id] = self.create_loan_row(book, today)
+    
+    def show_empty_loans(self):
+        """Show the empty message in the borrowed books list"""
+        self.empty_loans_label = tk.Label(self.borrowed_frame, text="No borrowed books", 
+                                        font=("Segoe UI", 11, "italic"), bg=self.colors["light_bg"], fg="#888")
+        self.empty_loans_label.pack(pady=20, padx=10)
+    
+    def add_loan_row(self, loan):
+        """Append the row of a new loan to the borrowed books list"""
+        if self.loan_rows is None:
+            # update_borrowed_list has not run yet and will include this loan
+            return
+        if self.empty_loans_label is not None:
+            self.empty_loans_label.destroy()
+            self.empty_loans_label = None
+        self.loan_rows[loan.id] = self.create_loan_row(loan, datetime.now())
+    
+    def remove_loan_row(self, book_id):
+        """Remove the row of a returned loan from the borrowed books list"""
+        if self.loan_rows is None:
+            return
+        row = self.loan_rows.pop(book_id, None)
+        if row is not None:
+            row.destroy()
+        if not self.loan_rows and self.empty_loans_label is None:
+            self.show_empty_loans()
+    
+    def create_loan_row(self, book, today):
+        """Create the row of one borrowed book and return its frame"""
+        # Calculate if overdue
+        due_date = datetime.strptime(book.due_date, "%d-%m-%Y")
+        is_overdue = due_date < today
+        
+        # Create card with different color if overdue
+        bg_color = "#fff4f4" if is_overdue else self.colors["text_light"]
+        border_color = self.colors["borrowed"] if is_overdue else "#ddd"
+        
+        item_frame = tk.Frame(self.borrowed_frame, bg=bg_color, padx=10, pady=10,
+                            highlightbackground=border_color, highlightthickness=1)
+        item_frame.pack(fill="x", padx=10, pady=5)
+        
+        # Book info
+        info_frame = tk.Frame(item_frame, bg=bg_color)
+        info_frame.pack(fill="x")
+        
+        tk.Label(info_frame, text=book.name, font=("Segoe UI", 12, "bold"), 
+               bg=bg_color, wraplength=200, anchor="w").pack(fill="x")
+        
+        tk.Label(info_frame, text=f"by {book.author}", font=("Segoe UI", 10), 
+               bg=bg_color, fg="#555").pack(anchor="w")
+        
+        # Due date with warning if overdue
+        date_frame = tk.Frame(item_frame, bg=bg_color)
+        date_frame.pack(fill="x", pady=(5, 0))
+        
+        date_text = f"Due: {book.due_date}"
+        date_color = "red" if is_overdue else "#555"
+        date_font = ("Segoe UI", 10, "bold") if is_overdue else ("Segoe UI", 10)
+        
+        tk.Label(date_frame, text=date_text, font=date_font, bg=bg_color, fg=date_color).pack(side="left")
+        
+        if is_overdue:
+            overdue_days = (today - due_date).days
+            tk.Label(date_frame, text=f"({overdue_days} days overdue)", 
+                   font=("Segoe UI", 9), bg=bg_color, fg="red").pack(side="left", padx=5)
+        
+        # Return button
+        button_frame = tk.Frame(item_frame, bg=bg_color)
+        button_frame.pack(fill="x", pady=(8, 0))
+        
+        return_btn = tk.Button(button_frame, text="Return Book", font=("Segoe UI", 10), 
+                              bg=self.colors["secondary"], fg=self.colors["text_light"],
+                              command=lambda book_id=book.id: self.return_book(book_id))
+        return_btn.pack(side="right")
+        return item_frame
 
 # Run the application
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+"""Incrementally maintained library statistics"""
+
+import heapq
+from datetime import datetime
+
+
+def parse_due_date(due_date):
+    """Parse a loan's "dd-mm-YYYY" due date"""
+    return datetime.strptime(due_date, "%d-%m-%Y")
+
+
+class LibraryStats:
+    """Book counters, per-category counts and overdue loans kept up to date.
+
+    Loans sit in a min-heap keyed by their parsed due date, so counting
+    overdue loans only pops the ones that became overdue since the last call.
+    Returned loans are not removed from the heap; their stale entries are
+    skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.available = 0
+        self.borrowed = 0
+        self.categories = {}   # category -> number of books
+        self.due_dates = {}    # book id -> due datetime of its active loan
+        self.due_heap = []     # (due datetime, book id), may hold stale entries
+        self.overdue = set()   # book ids of active loans already overdue
+
+    def build(self, books, borrowed):
+        """Compute everything once from the loaded catalog"""
+        self.__init__()
+        for book in books:
+            self.book_added(book)
+        for loan in borrowed:
+            self.track_loan(loan)
+        heapq.heapify(self.due_heap)
+
+    def book_added(self, book):
+        """Count a book added to the catalog"""
+        self.total += 1
+        if book.status == "available":
+            self.available += 1
+        else:
+            self.borrowed += 1
+        self.categories[book.category] = self.categories.get(book.category, 0) + 1
+
+    def track_loan(self, loan):
+        """Remember a loan's due date without reordering the heap"""
+        due = parse_due_date(loan.due_date)
+        self.due_dates[loan.id] = due
+        self.due_heap.append((due, loan.id))
+
+    def book_borrowed(self, loan):
+        """Move a book from available to borrowed and track its due date"""
+        self.available -= 1
+        self.borrowed += 1
+        due = parse_due_date(loan.due_date)
+        self.due_dates[loan.id] = due
+        heapq.heappush(self.due_heap, (due, loan.id))
+
+    def book_returned(self, book_id):
+        """Move a book back to available and forget its loan"""
+        self.available += 1
+        self.borrowed -= 1
+        self.due_dates.pop(book_id, None)
+        self.overdue.discard(book_id)
+
+    def status_changed(self, old_status, status):
+        """Move a book between available and borrowed without a loan"""
+        if old_status == "available":
+            self.available -= 1
+            self.borrowed += 1
+        if status == "available":
+            self.available += 1
+            self.borrowed -= 1
+
+    def advance(self, now):
+        """Move loans due before now from the heap into the overdue set"""
+        heap = self.due_heap
+        while heap and heap[0][0] < now:
+            due, book_id = heapq.heappop(heap)
+            if self.due_dates.get(book_id) == due:
+                self.overdue.add(book_id)
+
+    def overdue_count(self, now=None):
+        """Number of active loans that are overdue at now"""
+        self.advance(now or datetime.now())
+        return len(self.overdue)
+
+    def next_overdue_at(self, now=None):
+        """When the next active loan becomes overdue, or None; always after now"""
+        # Loans already due move to the overdue set, so a past date is never returned
+        self.advance(now or datetime.now())
+        heap = self.due_heap
+        while heap and self.due_dates.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def popular_category(self):
+        """Category with the most books, or "None" for an empty catalog"""
+        if not self.categories:
+            return "None"
+        return max(self.categories.items(), key=lambda x: x[1])[0]
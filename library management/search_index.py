@@ -0,0 +1,211 @@
+"""Inverted index used by the library search box and filters"""
+
+import heapq
+from collections import Counter, OrderedDict
+from operator import itemgetter
+
+
+def trigrams(text):
+    """Return the set of 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(query_grams, grams):
+    """(containment, Jaccard) of the query trigrams in a field's trigrams"""
+    if not grams:
+        return 0.0, 0.0
+    shared = len(query_grams & grams)
+    return shared / len(query_grams), shared / (len(query_grams) + len(grams) - shared)
+
+
+def create_search_index():
+    """Return the NumPy VectorIndex when NumPy is installed, else a SearchIndex"""
+    from vector_index import VectorIndex, np
+    if np is None:
+        return SearchIndex()
+    return VectorIndex()
+
+
+class SearchIndex:
+    """Trigram postings over book name/author plus category and status postings.
+
+    Substring queries of three or more characters intersect the postings of
+    the query's trigrams and only verify the surviving candidates, so a
+    keystroke never has to lowercase or scan the whole catalog.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop every posting list"""
+        self.texts = {}        # book id -> (lowercase name, lowercase author)
+        self.positions = {}    # book id -> position in the catalog
+        self.status_of = {}    # book id -> status it is indexed under
+        self.trigrams = {}     # trigram -> set of book ids
+        self.categories = {}   # category -> set of book ids
+        self.statuses = {}     # status -> set of book ids
+        self.next_position = 0
+
+    def build(self, books):
+        """Index every book of the catalog"""
+        self.clear()
+        for book in books:
+            self.add_book(book)
+
+    def add_book(self, book):
+        """Index a single book appended to the catalog"""
+        book_id = book.id
+        name = book.name.lower()
+        author = book.author.lower()
+
+        self.texts[book_id] = (name, author)
+        self.positions[book_id] = self.next_position
+        self.next_position += 1
+
+        # Name and author are indexed separately so no trigram spans both
+        for gram in trigrams(name) | trigrams(author):
+            self.trigrams.setdefault(gram, set()).add(book_id)
+        self.categories.setdefault(book.category, set()).add(book_id)
+        self.statuses.setdefault(book.status, set()).add(book_id)
+        self.status_of[book_id] = book.status
+
+    def update_status(self, book):
+        """Move a book to the status postings of its current status"""
+        book_id = book.id
+        old_status = self.status_of.get(book_id)
+        if old_status == book.status:
+            return
+        self.statuses.get(old_status, set()).discard(book_id)
+        self.statuses.setdefault(book.status, set()).add(book_id)
+        self.status_of[book_id] = book.status
+
+    def search(self, query="", category="All", status="all"):
+        """Return ids of matching books in catalog order.
+
+        query is matched case-insensitively as a substring of the name or the
+        author; category "All" and status "all" disable those filters.
+        """
+        return list(self.iter_search(query, category, status))
+
+    def iter_search(self, query="", category="All", status="all"):
+        """Yield ids of matching books in catalog order, verifying them lazily.
+
+        Only as many books are checked as the caller consumes, so showing the
+        first page of a broad query does not scan the whole catalog. Drop the
+        generator once the index changes.
+        """
+        query = query.lower()
+        candidates, filtered = self.candidates(query, category, status)
+        if filtered:
+            candidates = sorted(candidates, key=self.positions.__getitem__)
+        if query:
+            texts = self.texts
+            for book_id in candidates:
+                if query in texts[book_id][0] or query in texts[book_id][1]:
+                    yield book_id
+        else:
+            yield from candidates
+
+    def count(self, query="", category="All", status="all"):
+        """Number of matching books, without sorting or collecting them"""
+        query = query.lower()
+        candidates, filtered = self.candidates(query, category, status)
+        if not query:
+            return len(candidates)
+        texts = self.texts
+        return sum(1 for book_id in candidates
+                   if query in texts[book_id][0] or query in texts[book_id][1])
+
+    def ranked(self, query, category="All", status="all", k=50):
+        """Return ids of the k books most similar to query, best first.
+
+        A book scores by how many of the query's trigrams its name or author
+        contains, then by Jaccard similarity, so a typo such as "hobitt"
+        still finds "The Hobbit" and shorter close titles come first.
+        Candidates are counted from the trigram postings without scanning
+        the catalog, only the ones sharing the most trigrams are scored
+        exactly, and a bounded heap keeps the top k.
+        """
+        query = query.lower()
+        query_grams = trigrams(query)
+        if not query_grams:
+            return self.search(query, category, status)[:k]
+
+        shared = Counter()
+        for gram in query_grams:
+            postings = self.trigrams.get(gram)
+            if postings:
+                shared.update(postings)
+
+        filters = []
+        if category != "All":
+            filters.append(self.categories.get(category, set()))
+        if status != "all":
+            filters.append(self.statuses.get(status, set()))
+        counts = shared.items()
+        if filters:
+            allowed = set.intersection(*filters)
+            counts = [(book_id, count) for book_id, count in counts if book_id in allowed]
+
+        scored = []
+        for book_id, _ in heapq.nlargest(k * 4, counts, key=itemgetter(1)):
+            name, author = self.texts[book_id]
+            score = max(similarity(query_grams, trigrams(name)), similarity(query_grams, trigrams(author)))
+            scored.append((score, -self.positions[book_id], book_id))
+        return [book_id for _, _, book_id in heapq.nlargest(k, scored)]
+
+    def candidates(self, query, category, status):
+        """Return (ids that may match, whether postings narrowed them).
+
+        Without postings the candidates are every indexed id in catalog order;
+        otherwise they are an unordered set that still needs the substring check.
+        """
+        postings = []
+
+        if category != "All":
+            postings.append(self.categories.get(category, set()))
+        if status != "all":
+            postings.append(self.statuses.get(status, set()))
+        if len(query) >= 3:
+            for gram in trigrams(query):
+                postings.append(self.trigrams.get(gram, set()))
+
+        if not postings:
+            # Dicts keep insertion order, which is already catalog order
+            return self.texts.keys(), False
+        if len(postings) == 1:
+            # Callers only read the candidates, so the posting set itself will do
+            return postings[0], True
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:]), True
+
+
+class QueryCache:
+    """LRU cache of search results keyed by (query, category, status).
+
+    Cached results are only valid for the catalog they were computed from,
+    so every catalog mutation must call clear().
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        """Store result for key, evicting the least recently used entries"""
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every cached result"""
+        self.entries.clear()
@@ -0,0 +1,752 @@
+"""Storage backends for the library catalog and loans.
+
+Every backend loads a Catalog and is told about each mutation of it as an
+op tuple:
+
+    ("add", book)
+    ("borrow", book, loan)
+    ("return", book_id)
+
+Persisting a batch of ops happens in two steps: prepare() captures what has
+to be written without doing any I/O, and write() does the I/O. This lets
+WriteBehindStorage hold the app's lock only while capturing the data and
+run the slow part on its own thread.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from catalog import Catalog, Book
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def write_text_atomic(path, text):
+    """Write text to path via a temporary file and an atomic rename"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def dump_catalog(catalog):
+    """Serialize the catalog in the library_data.json format"""
+    return json.dumps(catalog.to_dict(), indent=4)
+
+
+def write_snapshot(path, catalog):
+    """Write the catalog to path atomically"""
+    write_text_atomic(path, dump_catalog(catalog))
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on path, shared by every process using it"""
+    with open(path, "a+") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield file
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_counter(lock):
+    """The next unreserved book id kept in a lock file"""
+    lock.seek(0)
+    text = lock.read().strip()
+    return int(text) if text else 0
+
+
+def write_counter(lock, value):
+    lock.seek(0)
+    lock.truncate()
+    lock.write(str(value))
+    lock.flush()
+
+
+def entry_of(op):
+    """The JSON record of an op, as written to the journal"""
+    if op[0] == "add":
+        return {"op": "add", "book": op[1].to_dict()}
+    if op[0] == "borrow":
+        return {"op": "borrow", "loan": op[2].to_dict()}
+    return {"op": "return", "id": op[1]}
+
+
+class StorageBackend:
+    """Shared helpers: single mutations are one-op batches written right away"""
+
+    # Last failure of work the backend does on its own threads, shown by status()
+    background_error = None
+
+    # True when other processes write the same data, so book ids must be reserved
+    shares_data = False
+
+    def record_add(self, book):
+        """Persist a newly added book"""
+        self.write(self.prepare([("add", book)]))
+
+    def record_borrow(self, book, loan):
+        """Persist a new loan"""
+        self.write(self.prepare([("borrow", book, loan)]))
+
+    def record_return(self, book_id):
+        """Persist a returned book"""
+        self.write(self.prepare([("return", book_id)]))
+
+    def reserve_ids(self, count):
+        """Return the first of count book ids reserved for this process, or None
+        when the catalog's own counter is enough because nobody else writes"""
+        return None
+
+    def poll(self):
+        """Return (data, conflicts) if another process changed the stored data, else None"""
+        return None
+
+    def close(self):
+        """Release any open files or connections"""
+
+
+class JsonStorage(StorageBackend):
+    """The original single-file JSON format, safe to share between app instances.
+
+    Every write happens under an advisory lock on path + ".lock": the file is
+    read again, the batch's ops are applied to what is on disk and the result
+    is written with its "version" number bumped, so instances never overwrite
+    each other's changes. A borrow of a book another instance lent first is
+    dropped and reported as a conflict. Book ids are handed out from a counter
+    kept in the lock file, so instances never create the same id. poll()
+    notices commits of other instances from the file's mtime and version.
+    """
+
+    shares_data = True
+
+    def __init__(self, path="library_data.json"):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.catalog = None
+        self.state_lock = threading.Lock()
+        self.version = None       # version the in-memory catalog matches
+        self.file_state = None    # (mtime, size) of the file at that version
+        self.conflicts = []
+
+    def read(self):
+        """Return the stored data and its (mtime, size), or (None, None)"""
+        try:
+            with open(self.path, "r") as file:
+                stat = os.fstat(file.fileno())
+                return json.load(file), (stat.st_mtime_ns, stat.st_size)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, None
+
+    def load(self):
+        """Return the stored Catalog, or None if there is no usable data"""
+        data, file_state = self.read()
+        if data is None:
+            self.version = 0
+            return None
+        self.version = data.get("version", 0)
+        self.file_state = file_state
+        return Catalog.from_dict(data)
+
+    def attach(self, catalog):
+        """Remember the app's catalog, seeding a missing file with it"""
+        self.catalog = catalog
+        if not os.path.exists(self.path):
+            # Writes merge onto the file, so the fallback data must be on disk first
+            self.save_all(catalog)
+
+    def save_all(self, catalog):
+        """Overwrite the stored data with the whole catalog"""
+        with file_lock(self.lock_path) as lock:
+            data, _ = self.read()
+            self.commit(lock, catalog, (data or {}).get("version", 0), in_sync=True)
+
+    def prepare(self, ops):
+        """Capture the ops as records; nothing of the catalog is read later"""
+        return [entry_of(op) for op in ops]
+
+    def write(self, entries):
+        """Apply the ops to the data currently on disk and write it back"""
+        with file_lock(self.lock_path) as lock:
+            data, _ = self.read()
+            catalog = Catalog.from_dict(data) if data is not None else Catalog()
+            version = (data or {}).get("version", 0)
+            conflicts = []
+            for entry in entries:
+                if entry["op"] == "add":
+                    # New books start available; the record may already show a borrow
+                    # queued in the same batch, which is applied after it
+                    book = Book.from_dict(entry["book"])
+                    book.status = "available"
+                    if not catalog.insert_book(book):
+                        conflicts.append(f"Book id {entry['book']['id']} was already used by another terminal")
+                elif entry["op"] == "borrow":
+                    loan = entry["loan"]
+                    if catalog.borrow(loan["id"], loan["due_date"]) is None:
+                        conflicts.append(f"'{loan['name']}' was already borrowed at another terminal")
+                elif entry["op"] == "return":
+                    catalog.return_book(entry["id"])
+            # Only when nobody else wrote since our last sync does the file now match memory
+            self.commit(lock, catalog, version, in_sync=version == self.version and not conflicts)
+        if conflicts:
+            with self.state_lock:
+                self.conflicts.extend(conflicts)
+
+    def commit(self, lock, catalog, version, in_sync):
+        """Write catalog as the next version; the caller holds the file lock"""
+        data = catalog.to_dict()
+        data["version"] = version + 1
+        write_text_atomic(self.path, json.dumps(data, indent=4))
+        # Ids written by instances that never reserved them must not be handed out again
+        if read_counter(lock) < catalog.next_id:
+            write_counter(lock, catalog.next_id)
+        if in_sync:
+            stat = os.stat(self.path)
+            with self.state_lock:
+                self.version = version + 1
+                self.file_state = (stat.st_mtime_ns, stat.st_size)
+
+    def reserve_ids(self, count):
+        """Reserve count consecutive book ids no other instance will use"""
+        with file_lock(self.lock_path) as lock:
+            first = max(read_counter(lock), self.catalog.next_id)
+            write_counter(lock, first + count)
+        return first
+
+    def poll(self):
+        """Return (data, conflicts) when another instance committed, else None"""
+        with self.state_lock:
+            conflicts, self.conflicts = self.conflicts, []
+            file_state = self.file_state
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return (None, conflicts) if conflicts else None
+        if (stat.st_mtime_ns, stat.st_size) == file_state and not conflicts:
+            return None
+
+        data, file_state = self.read()
+        if data is None or data.get("version", 0) == self.version:
+            with self.state_lock:
+                self.file_state = file_state
+            return (None, conflicts) if conflicts else None
+        with self.state_lock:
+            self.version = data.get("version", 0)
+            self.file_state = file_state
+        return data, conflicts
+
+
+class SqliteStorage(StorageBackend):
+    """SQLite database in WAL mode with one row per book and per loan.
+
+    Mutations touch a single indexed row each, so their cost does not depend
+    on the size of the catalog. An empty database is seeded from the JSON
+    file on first load.
+    """
+
+    def __init__(self, path="library.db", json_path="library_data.json"):
+        self.path = path
+        self.json_path = json_path
+        # Writes may come from the write-behind thread after loading on the Tk thread
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        """Create the tables and indexes if they do not exist yet"""
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS books (
+                                     id INTEGER PRIMARY KEY,
+                                     name TEXT NOT NULL,
+                                     author TEXT NOT NULL,
+                                     category TEXT NOT NULL,
+                                     status TEXT NOT NULL)""")
+            # seq keeps loans in the order they were made
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS borrowed (
+                                     seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                                     book_id INTEGER NOT NULL UNIQUE,
+                                     name TEXT NOT NULL,
+                                     author TEXT NOT NULL,
+                                     due_date TEXT NOT NULL)""")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS books_category ON books (category)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS books_status ON books (status)")
+
+    def is_empty(self):
+        """Return True if the database holds no books"""
+        return self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM books)").fetchone()[0]
+
+    def load(self):
+        """Return the stored Catalog, or None if there is no usable data"""
+        if self.is_empty():
+            if not os.path.exists(self.json_path):
+                return None
+            self.import_json(self.json_path)
+        return self.read_all()
+
+    def read_all(self):
+        """Read every book and loan, in catalog and loan order"""
+        books = [{"id": row[0], "name": row[1], "author": row[2], "status": row[4], "category": row[3]}
+                 for row in self.conn.execute("SELECT id, name, author, category, status FROM books ORDER BY id")]
+        borrowed = [{"id": row[0], "name": row[1], "author": row[2], "due_date": row[3]}
+                    for row in self.conn.execute("SELECT book_id, name, author, due_date FROM borrowed ORDER BY seq")]
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        return Catalog(books, borrowed, row[0] if row else None)
+
+    def attach(self, catalog):
+        """Seed an empty database with the app's fallback data"""
+        if self.is_empty():
+            self.save_all(catalog)
+
+    def save_all(self, catalog):
+        """Replace the whole catalog in one transaction"""
+        with self.conn:
+            self.conn.execute("DELETE FROM books")
+            self.conn.execute("DELETE FROM borrowed")
+            self.conn.executemany("INSERT INTO books (id, name, author, category, status) VALUES (?, ?, ?, ?, ?)",
+                                  [(b.id, b.name, b.author, b.category, b.status) for b in catalog.books])
+            self.conn.executemany("INSERT INTO borrowed (book_id, name, author, due_date) VALUES (?, ?, ?, ?)",
+                                  [(l.id, l.name, l.author, l.due_date) for l in catalog.borrowed])
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)", (catalog.next_id,))
+
+    def prepare(self, ops):
+        """Turn ops into the single-row statements that persist them"""
+        statements = []
+        for op in ops:
+            if op[0] == "add":
+                book = op[1]
+                statements.append(("INSERT INTO books (id, name, author, category, status) VALUES (?, ?, ?, ?, ?)",
+                                   (book.id, book.name, book.author, book.category, book.status)))
+                statements.append(("INSERT INTO meta (key, value) VALUES ('next_id', ?) "
+                                   "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+                                   (book.id + 1,)))
+            elif op[0] == "borrow":
+                loan = op[2]
+                statements.append(("UPDATE books SET status = 'borrowed' WHERE id = ?", (loan.id,)))
+                statements.append(("INSERT INTO borrowed (book_id, name, author, due_date) VALUES (?, ?, ?, ?)",
+                                   (loan.id, loan.name, loan.author, loan.due_date)))
+            elif op[0] == "return":
+                statements.append(("UPDATE books SET status = 'available' WHERE id = ?", (op[1],)))
+                statements.append(("DELETE FROM borrowed WHERE book_id = ?", (op[1],)))
+        return statements
+
+    def write(self, statements):
+        """Run a batch of statements in one transaction"""
+        with self.conn:
+            for sql, params in statements:
+                self.conn.execute(sql, params)
+
+    def import_json(self, path):
+        """Replace the database contents with a library_data.json file"""
+        with open(path, "r") as file:
+            data = json.load(file)
+        self.save_all(Catalog.from_dict(data))
+
+    def export_json(self, path):
+        """Write the database contents in the library_data.json format"""
+        write_snapshot(path, self.read_all())
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+class JournalStorage(StorageBackend):
+    """library_data.json snapshot plus an append-only journal of mutations.
+
+    Each add, borrow and return appends one JSON line to the journal, so a
+    click costs O(1) I/O. Loading replays the journal over the snapshot; a
+    torn last line from a crash mid-write is ignored. Once the journal grows
+    past compact_bytes it is rotated aside and a background thread writes a
+    new snapshot and swaps it in with an atomic rename. Replay is idempotent,
+    so a crash between the rename and deleting the rotated journal is safe.
+    If a compaction fails, its rotated journal stays on disk and the next
+    rotation appends to it, so no entry is dropped before a snapshot holds it.
+    """
+
+    def __init__(self, path="library_data.json", compact_bytes=1024 * 1024):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.rotated_path = path + ".journal.1"
+        self.compact_bytes = compact_bytes
+        self.catalog = None
+        self.journal = None
+        self.compactor = None
+        self.background_error = None
+
+    def load(self):
+        """Return the snapshot with the journal replayed, or None if there is no data"""
+        snapshot = JsonStorage(self.path).load()
+        catalog = snapshot if snapshot is not None else Catalog()
+        replayed = False
+        for journal_path in (self.rotated_path, self.journal_path):
+            entries = self.read_journal(journal_path)
+            if entries:
+                replay(catalog, entries)
+                replayed = True
+        if snapshot is None and not replayed:
+            return None
+        return catalog
+
+    def read_journal(self, journal_path):
+        """Return the complete entries of a journal, dropping a torn tail"""
+        entries = []
+        try:
+            with open(journal_path, "rb") as file:
+                good_size = 0
+                for line in file:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+                    good_size += len(line)
+        except FileNotFoundError:
+            return entries
+        # Cut off a half-written line so new entries start on a clean line
+        if good_size != os.path.getsize(journal_path):
+            with open(journal_path, "r+b") as file:
+                file.truncate(good_size)
+        return entries
+
+    def attach(self, catalog):
+        """Remember the app's catalog and open the journal for appending"""
+        self.catalog = catalog
+        self.journal = open(self.journal_path, "a")
+        # A missing snapshot or a journal left rotated by a crash is folded in right away
+        if not os.path.exists(self.path) or os.path.exists(self.rotated_path):
+            self.save_all(catalog)
+
+    def save_all(self, catalog):
+        """Write a fresh snapshot and start an empty journal"""
+        self.wait_for_compaction()
+        write_snapshot(self.path, catalog)
+        self.journal.truncate(0)
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+        self.background_error = None
+
+    def prepare(self, ops):
+        """Serialize ops as journal lines, with a state copy if compaction is due"""
+        lines = []
+        for op in ops:
+            if op[0] == "add":
+                lines.append(json.dumps({"op": "add", "book": op[1].to_dict()}) + "\n")
+            elif op[0] == "borrow":
+                lines.append(json.dumps({"op": "borrow", "loan": op[2].to_dict()}) + "\n")
+            elif op[0] == "return":
+                lines.append(json.dumps({"op": "return", "id": op[1]}) + "\n")
+        text = "".join(lines)
+
+        # Copy while the caller guarantees the catalog is not changing underneath us
+        snapshot = None
+        compacting = self.compactor is not None and self.compactor.is_alive()
+        if not compacting and self.journal.tell() + len(text) >= self.compact_bytes:
+            snapshot = self.catalog.copy()
+        return text, snapshot
+
+    def write(self, prepared):
+        """Durably append the lines, then start compaction if it is due"""
+        text, snapshot = prepared
+        self.journal.write(text)
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        if snapshot is not None:
+            self.start_compaction(snapshot)
+
+    def start_compaction(self, snapshot):
+        """Rotate the journal and write a new snapshot in the background"""
+        self.journal.close()
+        if os.path.exists(self.rotated_path):
+            # An earlier compaction failed and its entries are in no snapshot yet.
+            # A crash before the journal is removed leaves entries in both files,
+            # which replay tolerates
+            with open(self.journal_path, "rb") as source, open(self.rotated_path, "ab") as rotated:
+                shutil.copyfileobj(source, rotated)
+                rotated.flush()
+                os.fsync(rotated.fileno())
+            os.remove(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+        self.journal = open(self.journal_path, "a")
+        self.compactor = threading.Thread(target=self.compact, args=(snapshot,), daemon=True)
+        self.compactor.start()
+
+    def compact(self, snapshot):
+        """Worker side: swap in the new snapshot, then drop the rotated journal"""
+        try:
+            write_snapshot(self.path, snapshot)
+            os.remove(self.rotated_path)
+            self.background_error = None
+        except Exception as e:
+            # The rotated journal is kept and folded into the next compaction
+            self.background_error = e
+
+    def wait_for_compaction(self):
+        """Block until a running compaction has finished"""
+        if self.compactor is not None:
+            self.compactor.join()
+            self.compactor = None
+
+    def close(self):
+        """Finish compaction and close the journal"""
+        self.wait_for_compaction()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+def replay(catalog, entries):
+    """Apply journal entries to a catalog; applying an entry twice is harmless"""
+    for entry in entries:
+        op = entry.get("op")
+        if op == "add":
+            catalog.insert_book(Book.from_dict(entry["book"]))
+        elif op == "borrow":
+            loan = entry["loan"]
+            if catalog.get(loan["id"]) is not None:
+                catalog.restore_loan(loan)
+        elif op == "return":
+            catalog.return_book(entry["id"])
+
+
+# Book ids WriteBehindStorage reserves ahead at a time
+ID_BLOCK = 32
+
+
+class WriteBehindStorage:
+    """Persists mutations on a background thread so the Tk thread never waits on disk.
+
+    record_* calls only queue an op. The writer thread waits coalesce_ms for a
+    burst to settle, captures the whole batch with backend.prepare() under
+    lock and writes it with a single backend.write(). Code that mutates the
+    catalog must hold lock while doing so, because prepare() may read
+    them. flush() blocks until everything queued is on disk.
+
+    For a backend that shares its data, a block of ID_BLOCK book ids is
+    reserved ahead on a helper thread, so adding a book does not wait for
+    the cross-process lock on the Tk thread.
+    """
+
+    def __init__(self, backend, coalesce_ms=50):
+        self.backend = backend
+        self.coalesce_ms = coalesce_ms
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        self.pending = []
+        self.saving = False
+        self.closing = False
+        self.last_latency = None
+        self.last_error = None
+        self.writer = None
+        self.reserved_ids = None    # (first, end) of ids reserved ahead, or None
+        self.reserving = False
+
+    def load(self):
+        """Load through the wrapped backend"""
+        return self.backend.load()
+
+    def attach(self, catalog):
+        """Attach the app's catalog and start the writer thread"""
+        self.backend.attach(catalog)
+        self.writer = threading.Thread(target=self.run, name="library-writer", daemon=True)
+        self.writer.start()
+        if self.backend.shares_data:
+            self.refill_ids()
+
+    def save_all(self, catalog):
+        """Write the whole catalog once everything queued has been written"""
+        self.flush()
+        with self.lock:
+            self.backend.save_all(catalog)
+
+    def queue(self, op):
+        """Queue an op for the writer thread"""
+        with self.changed:
+            self.pending.append(op)
+            self.changed.notify_all()
+
+    def record_add(self, book):
+        self.queue(("add", book))
+
+    def record_borrow(self, book, loan):
+        self.queue(("borrow", book, loan))
+
+    def record_return(self, book_id):
+        self.queue(("return", book_id))
+
+    def record_batch(self, ops):
+        """Queue many ops at once so the writer persists them in one write"""
+        with self.changed:
+            self.pending.extend(ops)
+            self.changed.notify_all()
+
+    def reserve_ids(self, count):
+        """First of count book ids no other process uses, or None if the backend needs none.
+
+        Requests the reserved block can serve return at once; larger ones,
+        such as import batches sent from the import thread, wait for the
+        backend.
+        """
+        if not self.backend.shares_data:
+            return None
+        with self.lock:
+            if self.reserved_ids is not None:
+                first, end = self.reserved_ids
+                if end - first >= count:
+                    self.reserved_ids = (first + count, end) if first + count < end else None
+                    if self.reserved_ids is None:
+                        self.refill_ids()
+                    return first
+        return self.backend.reserve_ids(count)
+
+    def refill_ids(self):
+        """Reserve the next block of ids on a helper thread"""
+        with self.lock:
+            if self.reserving:
+                return
+            self.reserving = True
+        threading.Thread(target=self.reserve_block, name="library-ids", daemon=True).start()
+
+    def reserve_block(self):
+        """Helper thread: take ID_BLOCK ids from the backend"""
+        try:
+            first = self.backend.reserve_ids(ID_BLOCK)
+        except OSError:
+            # reserve_ids asks the backend directly until a later refill works
+            first = None
+        with self.lock:
+            self.reserving = False
+            if first is not None:
+                self.reserved_ids = (first, first + ID_BLOCK)
+
+    def poll(self):
+        """Changes of other processes, only once every local change is on disk.
+
+        Merging while ops are still queued would undo them in memory, so call
+        this holding lock and merge the result before releasing it.
+        """
+        with self.lock:
+            if self.pending or self.saving:
+                return None
+            return self.backend.poll()
+
+    def run(self):
+        """Writer thread: persist queued ops in coalesced batches"""
+        while True:
+            with self.changed:
+                while not self.pending and not self.closing:
+                    self.changed.wait()
+                if not self.pending or (self.closing and self.last_error is not None):
+                    # Once closing, a failing backend is not retried any more
+                    return
+
+            # Let a burst of clicks pile up into one write
+            time.sleep(self.coalesce_ms / 1000)
+
+            with self.changed:
+                ops, self.pending = self.pending, []
+                self.saving = True
+                prepared = self.backend.prepare(ops)
+
+            start = time.perf_counter()
+            try:
+                self.backend.write(prepared)
+                error = None
+            except Exception as e:
+                error = e
+
+            with self.changed:
+                if error is not None:
+                    # Keep the ops so the next batch retries them
+                    self.pending[:0] = ops
+                self.last_error = error
+                self.last_latency = time.perf_counter() - start
+                self.saving = False
+                self.changed.notify_all()
+                if error is not None and not self.closing:
+                    # close() wakes this up instead of waiting out the retry delay
+                    self.changed.wait(1)
+
+    def status(self):
+        """Return (state, detail) for a status indicator.
+
+        state is "saving", "unsaved", "error" or "saved"; detail is the
+        number of queued ops, the error or the last save latency in seconds.
+        """
+        with self.lock:
+            if self.last_error is not None:
+                return "error", self.last_error
+            if self.backend.background_error is not None:
+                return "error", self.backend.background_error
+            if self.saving:
+                return "saving", len(self.pending)
+            if self.pending:
+                return "unsaved", len(self.pending)
+            return "saved", self.last_latency
+
+    def flush(self, timeout=None):
+        """Block until every queued op has been written, or timeout seconds pass"""
+        with self.changed:
+            return self.changed.wait_for(lambda: not self.pending and not self.saving, timeout)
+
+    def close(self, timeout=10):
+        """Flush pending writes, stop the writer and close the backend.
+
+        Returns False if queued changes could not be written within timeout;
+        they are dropped. The backend is only closed once the writer has
+        stopped, so a write still hanging when timeout runs out never races it.
+        """
+        saved = self.flush(timeout)
+        with self.changed:
+            self.closing = True
+            self.changed.notify_all()
+        if self.writer is not None:
+            self.writer.join(timeout)
+            if self.writer.is_alive():
+                return False
+        self.backend.close()
+        return saved
+
+
+def open_storage(backend):
+    """Create the storage backend named by backend ("json", "journal" or "sqlite")"""
+    if backend == "sqlite":
+        return SqliteStorage()
+    if backend == "journal":
+        return JournalStorage()
+    if backend == "json":
+        return JsonStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+if __name__ == "__main__":
+    # python storage.py import|export <json file> [<database>]
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ("import", "export"):
+        sys.exit("usage: python storage.py import|export <json file> [<database>]")
+    storage = SqliteStorage(*sys.argv[3:4])
+    if sys.argv[1] == "import":
+        storage.import_json(sys.argv[2])
+    else:
+        storage.export_json(sys.argv[2])
+    storage.close()
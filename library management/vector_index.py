@@ -0,0 +1,169 @@
+"""NumPy-vectorized search over columnar copies of the catalog fields"""
+
+try:
+    import numpy as np
+except ImportError:  # create_search_index falls back to the pure-Python SearchIndex
+    np = None
+
+
+class VectorIndex:
+    """Catalog columns filtered with NumPy mask operations.
+
+    Each book is a row holding its id, a small-int category code, an
+    available flag and the offset of its "name\\0author\\0" text in one
+    lowercase UTF-8 buffer. A text query compares its rarest byte against
+    the whole buffer in one vectorized pass, narrows the surviving positions
+    byte by byte and maps them back to rows with searchsorted; when that byte
+    is very common, the query bytes are instead compared at every offset and
+    folded into rows with reduceat. The \\0 separators keep a match from
+    spanning fields or books. Columns grow by doubling, so adding a book is
+    amortized O(1).
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop every row"""
+        self.rows = 0
+        self.text_size = 0
+        self.ids = np.empty(1024, np.int64)
+        self.category_codes = np.empty(1024, np.int32)
+        self.available = np.empty(1024, bool)
+        self.offsets = np.empty(1024, np.int64)   # start of each row's text in the buffer
+        self.text = np.empty(64 * 1024, np.uint8)
+        self.byte_counts = np.zeros(256, np.int64)
+        self.category_codes_by_name = {}           # category -> code
+        self.row_of = {}                           # book id -> row
+        self.last_rows = None                      # ((query, category, status), matching rows)
+
+    def build(self, books):
+        """Index every book of the catalog with whole-column operations"""
+        self.clear()
+        books = list(books)
+        if not books:
+            return
+        texts = [f"{book.name}\0{book.author}\0".lower().encode() for book in books]
+        codes = self.category_codes_by_name
+        count = len(books)
+
+        self.ids = np.fromiter((book.id for book in books), np.int64, count)
+        self.category_codes = np.fromiter((codes.setdefault(book.category, len(codes)) for book in books),
+                                          np.int32, count)
+        self.available = np.fromiter((book.status == "available" for book in books), bool, count)
+        lengths = np.fromiter(map(len, texts), np.int64, count)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        self.text = np.frombuffer(b"".join(texts), np.uint8).copy()
+        self.byte_counts = np.bincount(self.text, minlength=256).astype(np.int64)
+        self.row_of = {book.id: row for row, book in enumerate(books)}
+        self.last_rows = None
+        self.rows = count
+        self.text_size = len(self.text)
+
+    def add_book(self, book):
+        """Append a single book as a new row"""
+        if self.rows == len(self.ids):
+            for name in ("ids", "category_codes", "available", "offsets"):
+                setattr(self, name, grow(getattr(self, name), self.rows + 1))
+        data = np.frombuffer(f"{book.name}\0{book.author}\0".lower().encode(), np.uint8)
+        if self.text_size + len(data) > len(self.text):
+            self.text = grow(self.text, self.text_size + len(data))
+
+        row = self.rows
+        codes = self.category_codes_by_name
+        self.ids[row] = book.id
+        self.category_codes[row] = codes.setdefault(book.category, len(codes))
+        self.available[row] = book.status == "available"
+        self.offsets[row] = self.text_size
+        self.text[self.text_size:self.text_size + len(data)] = data
+        self.byte_counts += np.bincount(data, minlength=256)
+        self.text_size += len(data)
+        self.row_of[book.id] = row
+        self.rows += 1
+        self.last_rows = None
+
+    def update_status(self, book):
+        """Refresh the available flag of a book"""
+        row = self.row_of.get(book.id)
+        if row is not None:
+            self.available[row] = book.status == "available"
+            self.last_rows = None
+
+    def mask(self, query, category, status):
+        """Boolean row mask of the books matching every filter"""
+        rows = self.rows
+        mask = np.ones(rows, bool)
+        if category != "All":
+            code = self.category_codes_by_name.get(category)
+            if code is None:
+                return np.zeros(rows, bool)
+            mask &= self.category_codes[:rows] == code
+        if status == "available":
+            mask &= self.available[:rows]
+        elif status == "borrowed":
+            mask &= ~self.available[:rows]
+        elif status != "all":
+            return np.zeros(rows, bool)
+        if query and mask.any():
+            mask &= self.text_mask(query.lower())
+        return mask
+
+    def text_mask(self, query):
+        """Rows whose name or author contains query"""
+        pattern = np.frombuffer(query.encode(), np.uint8)
+        found = np.zeros(self.rows, bool)
+        if len(pattern) > self.text_size or "\0" in query:
+            # A separator in the query could only match across fields
+            return found
+        counts = self.byte_counts[pattern]
+        if counts.min() == 0:
+            # Some byte of the query occurs nowhere in the catalog
+            return found
+        text = self.text[:self.text_size]
+        last_start = self.text_size - len(pattern)
+
+        # Anchor on the rarest byte of the query so the first pass keeps the fewest positions
+        anchor = int(np.argmin(counts))
+        if counts[anchor] > self.text_size // 16:
+            # Too many positions to track one by one: match at every offset instead
+            matches = np.zeros(self.text_size, bool)
+            starts = matches[:last_start + 1]
+            np.equal(text[:last_start + 1], pattern[0], out=starts)
+            for k in range(1, len(pattern)):
+                starts &= text[k:last_start + 1 + k] == pattern[k]
+            return np.logical_or.reduceat(matches, self.offsets[:self.rows])
+
+        positions = np.flatnonzero(text == pattern[anchor]) - anchor
+        positions = positions[(positions >= 0) & (positions <= last_start)]
+        for k in range(len(pattern)):
+            if k != anchor:
+                positions = positions[text[positions + k] == pattern[k]]
+
+        found[np.searchsorted(self.offsets[:self.rows], positions, side="right") - 1] = True
+        return found
+
+    def matching_rows(self, query, category, status):
+        """Rows matching the filters, reused when count() and iter_search() ask in turn"""
+        key = (query, category, status)
+        if self.last_rows is None or self.last_rows[0] != key:
+            self.last_rows = (key, np.flatnonzero(self.mask(query, category, status)))
+        return self.last_rows[1]
+
+    def iter_search(self, query="", category="All", status="all"):
+        """Yield ids of matching books in catalog order"""
+        yield from self.ids[self.matching_rows(query, category, status)].tolist()
+
+    def search(self, query="", category="All", status="all"):
+        """Return ids of matching books in catalog order"""
+        return list(self.iter_search(query, category, status))
+
+    def count(self, query="", category="All", status="all"):
+        """Number of matching books"""
+        return len(self.matching_rows(query, category, status))
+
+
+def grow(array, needed):
+    """Return a copy of array with at least needed slots, doubling its size"""
+    larger = np.empty(max(needed, 2 * len(array)), array.dtype)
+    larger[:len(array)] = array
+    return larger
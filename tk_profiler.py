@@ -0,0 +1,264 @@
+"""Opt-in Tk event-loop profiler and stall detector for the Tkinter apps.
+
+Runs an app script with every Tk callback timed: Button commands, event
+bindings and after/after_idle callbacks pass through tkinter.Misc._register,
+variable traces through tkinter.Variable._register, and both are wrapped to
+record wall time per handler.
+A watchdog thread samples the main thread's stack while a handler runs and
+flags handlers that block the main loop for longer than the threshold.
+
+Press F12 in the app for a sortable table of handlers and stalls. On exit
+the profile is written as JSON and, next to it, as collapsed stacks
+(.folded) for flamegraph.pl or speedscope.
+
+    python tk_profiler.py "library management/library.py"
+    python tk_profiler.py --threshold-ms 100 --output food.json "Food Ordering/foodOrderingApp.py"
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+
+def describe(func):
+    """Readable name for a callback, with file:line for lambdas and closures"""
+    target = getattr(func, "__func__", func)
+    name = getattr(target, "__qualname__", None) or type(target).__name__
+    code = getattr(target, "__code__", None)
+    if code is not None and "<" in name:
+        name = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+
+def after_target(func):
+    """The function scheduled by Misc.after, found in the closure of its callit wrapper"""
+    for cell in func.__closure__ or ():
+        value = cell.cell_contents
+        if callable(value) and not isinstance(value, tk.Misc):
+            return value
+    return func
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class TkProfiler:
+    """Times Tk callbacks and watches the main loop for stalls"""
+
+    def __init__(self, threshold_ms=200, sample_ms=5):
+        self.threshold = threshold_ms / 1000
+        self.sample_interval = sample_ms / 1000
+        self.lock = threading.Lock()
+        self.handlers = {}      # label -> [calls, total seconds, max seconds]
+        self.stalls = []        # one dict per handler call longer than the threshold
+        self.stacks = {}        # collapsed stack -> sample count
+        self.current = None     # (label, start, call number) of the running handler
+        self.calls = 0
+        self.timed_code = None  # code of the wrapper that times every handler
+        self.main_thread = threading.main_thread().ident
+        self.original_register = None
+        self.original_variable_register = None
+        self.internal = set()   # functions of the profiler itself, never timed
+        self.root = None
+        self.panel = None
+
+    def install(self):
+        """Wrap Tk callback registration and start the watchdog"""
+        profiler = self
+        original_register = self.original_register = tk.Misc._register
+        original_variable_register = self.original_variable_register = tk.Variable._register
+        original_tk_init = tk.Tk.__init__
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            return original_register(widget, profiler.wrap(func, subst), subst, needcleanup)
+
+        def variable_register(variable, func):
+            return original_variable_register(variable, profiler.wrap(func, None, "trace"))
+
+        def tk_init(root, *args, **kwargs):
+            original_tk_init(root, *args, **kwargs)
+            if profiler.root is None and root.tk.call("info", "commands", "bind"):
+                # tkinter.Tcl() interpreters have no widgets to bind keys to
+                profiler.root = root
+                root.bind_all("<F12>", profiler.toggle_panel)
+
+        self.internal.update({self.toggle_panel.__func__, self.refresh_panel.__func__})
+        tk.Misc._register = _register
+        tk.Variable._register = variable_register
+        tk.Tk.__init__ = tk_init
+        threading.Thread(target=self.watch, name="tk-profiler-watchdog", daemon=True).start()
+
+    def wrap(self, func, subst, kind=None):
+        """Return func timed under a descriptive label"""
+        target = func
+        if kind is None and getattr(func, "__qualname__", "").endswith("after.<locals>.callit"):
+            target = after_target(func)
+            kind = "after"
+        elif kind is None:
+            kind = "event" if subst is not None else "command"
+        if getattr(target, "__func__", target) in self.internal:
+            return func
+        label = f"{kind}: {describe(target)}"
+
+        @functools.wraps(func)
+        def timed(*args):
+            with self.lock:
+                self.calls += 1
+                call = self.calls
+                outer = self.current
+                start = time.perf_counter()
+                self.current = (label, start, call)
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    # Nested callbacks (e.g. update() inside a handler) resume the outer one
+                    self.current = outer
+                    stats = self.handlers.setdefault(label, [0, 0.0, 0.0])
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    stats[2] = max(stats[2], elapsed)
+                    if self.stalls and self.stalls[-1]["call"] == call:
+                        self.stalls[-1]["duration_ms"] = elapsed * 1000
+        self.timed_code = timed.__code__
+        return timed
+
+    def watch(self):
+        """Watchdog thread: sample the main thread's stack while a handler runs"""
+        reported = None
+        while True:
+            time.sleep(self.sample_interval)
+            with self.lock:
+                current = self.current
+            if current is None:
+                continue
+            label, start, call = current
+            frame = sys._current_frames().get(self.main_thread)
+            if frame is None:
+                continue
+            # Keep the frames above the innermost timed wrapper, i.e. the handler's own
+            names = []
+            while frame is not None and frame.f_code is not self.timed_code:
+                names.append(frame_name(frame))
+                frame = frame.f_back
+            names = names[:40][::-1]
+            collapsed = ";".join([label] + names)
+            with self.lock:
+                self.stacks[collapsed] = self.stacks.get(collapsed, 0) + 1
+                elapsed = time.perf_counter() - start
+                if elapsed > self.threshold and reported != call:
+                    reported = call
+                    self.stalls.append({
+                        "call": call,
+                        "handler": label,
+                        "detected_at_ms": elapsed * 1000,
+                        "duration_ms": None,
+                        "stack": names
+                    })
+                    print(f"[tk_profiler] main loop stalled {elapsed * 1000:.0f} ms in {label}", file=sys.stderr)
+
+    def snapshot(self):
+        """Handler statistics sorted by total time"""
+        with self.lock:
+            rows = [{
+                "handler": label,
+                "calls": calls,
+                "total_ms": total * 1000,
+                "mean_ms": total * 1000 / calls,
+                "max_ms": longest * 1000
+            } for label, (calls, total, longest) in self.handlers.items()]
+            stalls = [dict(stall) for stall in self.stalls]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows, stalls
+
+    def dump(self, path):
+        """Write the profile as JSON plus collapsed stacks in path minus .json plus .folded"""
+        rows, stalls = self.snapshot()
+        with open(path, "w") as file:
+            json.dump({"threshold_ms": self.threshold * 1000, "handlers": rows, "stalls": stalls}, file, indent=4)
+        with self.lock:
+            stacks = sorted(self.stacks.items())
+        with open(os.path.splitext(path)[0] + ".folded", "w") as file:
+            for stack, count in stacks:
+                file.write(f"{stack} {count}\n")
+
+    def toggle_panel(self, event=None):
+        """Show or hide the in-app profile table"""
+        if self.panel is not None and self.panel.winfo_exists():
+            self.panel.destroy()
+            self.panel = None
+            return
+
+        self.panel = tk.Toplevel(self.root)
+        self.panel.title("Tk Profiler")
+        self.panel.geometry("760x420")
+        columns = ("calls", "total_ms", "mean_ms", "max_ms")
+        self.table = ttk.Treeview(self.panel, columns=columns)
+        self.table.heading("#0", text="handler", command=lambda: self.sort_by("handler"))
+        self.table.column("#0", width=380)
+        for column in columns:
+            self.table.heading(column, text=column, command=lambda c=column: self.sort_by(c))
+            self.table.column(column, width=80, anchor="e")
+        self.table.pack(fill="both", expand=True)
+
+        self.stall_label = tk.Label(self.panel, anchor="w", justify="left", font=("Consolas", 9))
+        self.stall_label.pack(fill="x")
+        self.sort_key = "total_ms"
+        self.refresh_panel()
+
+    def sort_by(self, key):
+        self.sort_key = key
+        self.refresh_panel(reschedule=False)
+
+    def refresh_panel(self, reschedule=True):
+        """Redraw the table every second while the panel is open"""
+        if self.panel is None or not self.panel.winfo_exists():
+            return
+        rows, stalls = self.snapshot()
+        rows.sort(key=lambda row: row[self.sort_key], reverse=self.sort_key != "handler")
+        self.table.delete(*self.table.get_children())
+        for row in rows:
+            self.table.insert("", "end", text=row["handler"], values=(
+                row["calls"], f"{row['total_ms']:.1f}", f"{row['mean_ms']:.2f}", f"{row['max_ms']:.1f}"))
+        self.stall_label.config(text="\n".join(
+            f"stall {stall['detected_at_ms']:.0f}+ ms in {stall['handler']} at {stall['stack'][-1]}"
+            for stall in stalls[-5:]) or "No stalls")
+        if reschedule:
+            self.panel.after(1000, self.refresh_panel)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Tkinter app with its callbacks profiled")
+    parser.add_argument("--threshold-ms", type=float, default=200, help="report handlers blocking longer than this")
+    parser.add_argument("--sample-ms", type=float, default=5, help="stack sampling interval")
+    parser.add_argument("--output", default="tk_profile.json", help="profile written on exit")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    script = os.path.abspath(args.script)
+    profiler = TkProfiler(args.threshold_ms, args.sample_ms)
+    profiler.install()
+    atexit.register(profiler.dump, output)
+
+    # The apps open their data and images relative to their own folder
+    os.chdir(os.path.dirname(script))
+    sys.path.insert(0, os.path.dirname(script))
+    sys.argv = [script] + args.args
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()